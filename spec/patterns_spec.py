@@ -78,6 +78,52 @@ async def read_item(item_id: int):
         results = detect_http_endpoints("app.py", "python", code)
         assert len(results) > 0
 
+    def it_extracts_route_paths(self):
+        """Should report the route path, not the router or method name."""
+        from comby_skill.patterns.http_endpoints import detect_http_endpoints
+
+        fastapi = detect_http_endpoints(
+            "app.py", "python", '@router.get("/items/{item_id}")\n', "fastapi"
+        )
+        assert [r.path for r in fastapi] == ["/items/{item_id}"]
+
+        express = detect_http_endpoints(
+            "app.js", "javascript", "app.post('/api/users', createUser)\n", "express"
+        )
+        assert [(r.method.value, r.path) for r in express] == [("post", "/api/users")]
+
+    def it_reports_the_framework(self):
+        """Should tag endpoints with the detected or hinted Framework."""
+        from comby_skill.patterns import Framework, detect_http_endpoints, classify_endpoints
+
+        code = "from flask import Flask\n@app.get('/items')\n"
+        detected = detect_http_endpoints("app.py", "python", code)
+        assert [r.framework for r in detected] == [Framework.FLASK]
+
+        hinted = detect_http_endpoints("app.py", "python", "@app.get('/items')\n", Framework.FASTAPI)
+        assert [r.framework for r in hinted] == [Framework.FASTAPI]
+        assert classify_endpoints(hinted)["endpoints_by_framework"] == {"fastapi": 1}
+
+    def it_accepts_a_framework_name(self):
+        """Should turn a framework name into its Framework."""
+        from comby_skill.patterns import Framework, HTTPEndpoint, HTTPMethod
+
+        endpoint = HTTPEndpoint("app.py", 1, HTTPMethod.GET, "/items", "flask")
+        assert endpoint.framework == Framework.FLASK
+
+    def it_classifies_hand_built_endpoints(self):
+        """Should classify endpoints built outside the detector."""
+        from comby_skill.patterns import HTTPEndpoint, HTTPMethod, classify_endpoints
+
+        endpoints = [
+            HTTPEndpoint("app.py", 1, HTTPMethod.GET, "/items", "flask"),
+            HTTPEndpoint("app.py", 2, HTTPMethod.POST, "/items/add", "flask"),
+        ]
+        classification = classify_endpoints(endpoints)
+        assert classification["endpoints_by_method"] == {"get": 1, "post": 1}
+        assert classification["endpoints_by_framework"] == {"flask": 2}
+        assert classification["restfulness"]["issues"] == ["/items/add uses post"]
+
     def it_classifies_endpoints(self):
         """Should classify HTTP endpoints."""
         from comby_skill.patterns.http_endpoints import (
@@ -136,6 +182,84 @@ def hash_password(password):
         assert len(results) > 0
         assert any(r.is_secure for r in results)
 
+    def it_attaches_nearby_insecure_patterns(self):
+        """Should flag insecure code within two lines of a boundary only."""
+        from comby_skill.patterns.auth_boundaries import detect_auth_boundaries
+
+        code = """
+@login_required
+def check(password):
+    if password == "hunter2":
+        return True
+
+
+
+
+@jwt_required
+def other():
+    return False
+"""
+        results = detect_auth_boundaries("auth.py", "python", code)
+        by_name = {r.name: r for r in results}
+        assert by_name["@login_required"].issues
+        assert by_name["@jwt_required"].issues == []
+
+    def it_searches_each_boundary_window_on_its_own(self):
+        """Should not let a match starting outside a window hide one inside it."""
+        from comby_skill.patterns.auth_boundaries import (
+            check_insecure_patterns,
+            detect_auth_boundaries,
+        )
+
+        code = "if\n\n\n\n\nuser.is_authenticated: x if user.is_authenticated: pass\n@login_required\n"
+        results = detect_auth_boundaries("auth.py", "python", code)
+        assert results
+        for boundary in results:
+            assert boundary.issues
+            assert boundary.issues == check_insecure_patterns("python", code, boundary.line_number)
+
+    def it_returns_fresh_results_from_the_cache(self):
+        """Should not let one caller's changes show up in later results."""
+        from comby_skill.patterns.auth_boundaries import detect_auth_boundaries
+
+        code = """
+@login_required
+def check(password):
+    if password == "hunter2":
+        return True
+"""
+        first = detect_auth_boundaries("cached_auth.py", "python", code)
+        expected = [(r.name, list(r.issues)) for r in first]
+        first[0].issues.append("changed by a caller")
+        first[0].name = "changed"
+
+        second = detect_auth_boundaries("cached_auth.py", "python", code)
+        assert [(r.name, r.issues) for r in second] == expected
+        second[0].issues.clear()
+
+        third = detect_auth_boundaries("cached_auth.py", "python", code)
+        assert [(r.name, r.issues) for r in third] == expected
+
+    def it_serves_cache_hits_faster_than_a_recompute(self):
+        """Should not spend more on a cache hit than on running the patterns."""
+        import timeit
+        from comby_skill.patterns.auth_boundaries import detect_auth_boundaries
+
+        code = """
+@login_required
+def check(password):
+    if password == "hunter2":
+        return True
+""" * 50
+        detect_auth_boundaries("timed_auth.py", "python", code)
+        hit = min(timeit.repeat(
+            lambda: detect_auth_boundaries("timed_auth.py", "python", code), number=5, repeat=5,
+        ))
+        recompute = min(timeit.repeat(
+            lambda: detect_auth_boundaries.__wrapped__("timed_auth.py", "python", code), number=5, repeat=5,
+        ))
+        assert hit < recompute
+
 
 class DescribeExternalDependenciesPatterns:
     """Tests for EXTERNAL_DEPENDENCIES pattern family."""
@@ -163,6 +287,18 @@ s3.upload_fileobj(file, bucket, key)
         results = detect_external_dependencies("s3.py", "python", code)
         assert len(results) > 0
 
+    def it_detects_service_types(self):
+        """Should report only the services a file names, in any case."""
+        from comby_skill.patterns.external_deps import (
+            ExternalServiceType,
+            detect_service_types,
+        )
+
+        assert detect_service_types("def add(a, b):\n    return a + b\n") == {}
+
+        services = detect_service_types("import Stripe\nSTRİPE.Charge.create()\n")
+        assert services == {ExternalServiceType.PAYMENT_GATEWAY: "Payment"}
+
 
 class DescribeComplexityPatterns:
     """Tests for CODE_COMPLEXITY pattern family."""
@@ -199,6 +335,130 @@ def simple():
 
         assert "complexity_distribution" in classification
 
+    def it_reuses_results_for_unchanged_content(self):
+        """Should return cached metrics until the content changes."""
+        from comby_skill.patterns.complexity import analyze_complexity
+
+        code = """
+def simple():
+    return 1
+"""
+        first = analyze_complexity("cached.py", "python", code)
+        second = analyze_complexity("cached.py", "python", code)
+        assert first == second
+        assert first is not second
+
+        changed = analyze_complexity("cached.py", "python", code + "\ndef other(a, b):\n    return a\n")
+        assert len(changed) == 2
+
+
+class DescribeDuplicationPatterns:
+    """Tests for DUPLICATION pattern family."""
+
+    # Lines the random sources are built from: comments, strings, blank and
+    # whitespace-only lines, tabs, carriage returns and non-ASCII text
+    LINES = [
+        "x = compute(a, b)",
+        "    x = compute(a, b)  # same",
+        "\tif value:\r",
+        "return 'text'",
+        'print("café #1")',
+        "// only a comment",
+        "# another comment",
+        "",
+        "   ",
+        "total += item.price * qty",
+        "for item in items:",
+        "y = 1",
+    ]
+
+    @staticmethod
+    def _naive_normalize(code):
+        """Normalize code one line at a time, as the detector first did."""
+        import re
+
+        normalized = []
+        for line in code.split("\n"):
+            line = re.sub(r"//.*$", "", line)
+            line = re.sub(r"#.*$", "", line)
+            line = re.sub(r'"[^"]*"', '"__STR__"', line)
+            line = re.sub(r"'[^']*'", "'__STR__'", line)
+            line = re.sub(r"\s+", " ", line.strip())
+            if line:
+                normalized.append(line)
+        return "\n".join(normalized)
+
+    def _random_sources(self, count):
+        import random
+
+        rng = random.Random(7)
+        return [
+            "\n".join(rng.choice(self.LINES) for _ in range(rng.randint(0, 40)))
+            for _ in range(count)
+        ]
+
+    def it_hashes_windows_like_naive_md5_windowing(self):
+        """Should keep and group the windows that per-window MD5 hashing does."""
+        import hashlib
+        from comby_skill.patterns.duplication import calculate_hash, extract_code_blocks
+
+        for block_size in (1, 3, 5):
+            blocks = []
+            naive = []
+            for n, source in enumerate(self._random_sources(40)):
+                blocks.extend(extract_code_blocks(f"f{n}.py", "python", source, block_size))
+                lines = source.split("\n")
+                for i in range(len(lines) - block_size + 1):
+                    block = "\n".join(lines[i:i + block_size])
+                    normalized = self._naive_normalize(block)
+                    if len(normalized) >= block_size * 2:
+                        digest = hashlib.md5(normalized.encode()).hexdigest()
+                        naive.append((block, f"f{n}.py", i + 1, i + block_size, normalized, digest))
+
+            assert [block[:4] for block in blocks] == [block[:4] for block in naive]
+            assert [block[5] for block in blocks] == [block[4] for block in naive]
+            for block in blocks:
+                assert calculate_hash(block[0], min_lines=1) == block[4]
+
+            # Equal rolling hashes exactly where the MD5 digests are equal
+            groups = {}
+            for block, (*_, digest) in zip(blocks, naive):
+                groups.setdefault(block[4], set()).add(digest)
+            assert all(len(digests) == 1 for digests in groups.values())
+            assert len(groups) == len({digest for *_, digest in naive})
+
+    def it_finds_the_similar_pairs_that_scoring_every_pair_does(self):
+        """Should find the same pairs, in the same order, as the all-pairs loop."""
+        import random
+        from comby_skill.patterns.duplication import extract_code_blocks, find_similar_blocks
+
+        rng = random.Random(11)
+        vocabulary = ["a", "b", "c", "d", "e", "f", "g", "(", ")", "=", "+", "if", "return"]
+        plain_blocks = [
+            (" ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8))), "f.py", n, n)
+            for n in range(120)
+        ]
+        extracted_blocks = []
+        for n, source in enumerate(self._random_sources(10)):
+            extracted_blocks.extend(extract_code_blocks(f"f{n}.py", "python", source, 3))
+
+        for blocks in (plain_blocks, extracted_blocks):
+            for threshold in (0.0, 0.3, 0.5, 0.8, 1.0):
+                expected = []
+                for i, (content1, path1, start1, end1, *_) in enumerate(blocks):
+                    for content2, path2, start2, end2, *_ in blocks[i + 1:]:
+                        tokens1 = set(self._naive_normalize(content1).split())
+                        tokens2 = set(self._naive_normalize(content2).split())
+                        similarity = 0.0
+                        if tokens1 and tokens2:
+                            similarity = len(tokens1 & tokens2) / len(tokens1 | tokens2)
+                        if similarity >= threshold:
+                            expected.append((
+                                (path1, start1, end1, similarity),
+                                (path2, start2, end2, similarity),
+                            ))
+                assert find_similar_blocks(blocks, threshold) == expected, threshold
+
 
 class DescribeErrorHandlingPatterns:
     """Tests for ERROR_HANDLING pattern family."""
@@ -0,0 +1,223 @@
+"""BDD tests for the pattern analysis in the shared regex backend."""
+
+import re
+
+import pytest
+
+
+# Text the patterns below are checked against, one sample per line
+SAMPLE_TEXT = """hello world
+colour color colr
+abcdefg defg abcabcx
+foo bar abc abd
+main.py util.py a1b aXb a b
+a
+b
+say Hello HELLO
+"""
+
+
+class DescribeRequiredLiteral:
+    """Tests for required_literal."""
+
+    CASES = [
+        # (pattern, flags, literal)
+        ("hello", 0, "hello"),
+        ("foo|bar", 0, None),
+        ("abc|abd", 0, "ab"),
+        ("ab(cd|ef)ghi", 0, "ghi"),
+        ("colou?r", 0, "colo"),
+        ("(abc)?defg", 0, "defg"),
+        ("(?:abc)+x", 0, "abc"),
+        ("x(?:abc)*", 0, "x"),
+        (r"\d+\.py", 0, ".py"),
+        ("(?i)hello", 0, None),
+        ("(?i)hello", re.IGNORECASE, "hello"),
+        ("(?i:hello)world", 0, "world"),
+        ("(unclosed", 0, None),
+    ]
+
+    def it_finds_the_longest_required_literal(self):
+        """Should return the longest literal every match contains."""
+        from comby_skill._regex import required_literal
+
+        for pattern, flags, literal in self.CASES:
+            assert required_literal(pattern, flags) == literal, pattern
+
+    def it_never_names_text_a_match_lacks(self):
+        """Should only return literals found in every match."""
+        from comby_skill._regex import required_literal
+
+        for pattern, flags, literal in self.CASES:
+            if literal is None:
+                continue
+            for match in re.finditer(pattern, SAMPLE_TEXT, flags):
+                text = match.group()
+                if flags & re.IGNORECASE:
+                    text, literal = text.casefold(), literal.casefold()
+                assert literal in text, pattern
+
+
+class DescribeLiteralPrefix:
+    """Tests for literal_prefix."""
+
+    def it_finds_the_literal_start_of_every_match(self):
+        """Should return the literal text every match starts with."""
+        from comby_skill._regex import literal_prefix
+
+        cases = [
+            ("hello", "hello"),
+            ("colou?r", "colo"),
+            ("abc|abd", "ab"),
+            ("(abc)?defg", ""),
+            ("(?i)hello", ""),
+            (r"\d+\.py", ""),
+        ]
+        for pattern, prefix in cases:
+            assert literal_prefix(pattern) == prefix, pattern
+
+
+class DescribeIsLineLocal:
+    """Tests for is_line_local."""
+
+    CASES = [
+        # (pattern, flags, line-local)
+        ("hello", 0, True),
+        ("a.b", 0, True),
+        ("a.b", re.DOTALL, False),
+        ("(?s)a.b", 0, False),
+        ("(?s:a.b)", 0, False),
+        ("(?-s:a.b)", re.DOTALL, True),
+        (r"a\nb", 0, False),
+        (r"a\sb", 0, False),
+        (r"a\Sb", 0, True),
+        (r"a\wb", 0, True),
+        (r"a\Wb", 0, False),
+        (r"a\db", 0, True),
+        (r"a\Db", 0, False),
+        ("a[^x]b", 0, False),
+        (r"a[^x\n]b", 0, True),
+        (r"[\s\S]", 0, False),
+        ("^abc$", 0, True),
+        (r"\bfoo", 0, True),
+        (r"foo\B", 0, False),
+        (r"\Aabc", 0, False),
+        (r"abc\Z", 0, False),
+        (r"(a)\1", 0, True),
+        ("(unclosed", 0, False),
+    ]
+
+    def it_tells_which_patterns_never_cross_a_newline(self):
+        """Should accept only patterns that match the same per line and per text."""
+        from comby_skill._regex import is_line_local
+
+        for pattern, flags, line_local in self.CASES:
+            assert is_line_local(pattern, flags) == line_local, pattern
+
+    def it_finds_the_per_line_matches_in_one_scan(self):
+        """Should find the same matches scanning the whole text in MULTILINE mode."""
+        from comby_skill._regex import is_line_local
+
+        for pattern, flags, line_local in self.CASES:
+            if not line_local:
+                continue
+            per_line = [
+                (line_num, match.span())
+                for line_num, line in enumerate(SAMPLE_TEXT.split("\n"))
+                for match in re.finditer(pattern, line, flags)
+            ]
+            starts = [0] + [i + 1 for i, c in enumerate(SAMPLE_TEXT) if c == "\n"]
+            whole = []
+            for match in re.finditer(pattern, SAMPLE_TEXT, flags | re.MULTILINE):
+                line_num = SAMPLE_TEXT.count("\n", 0, match.start())
+                start = starts[line_num]
+                whole.append((line_num, (match.start() - start, match.end() - start)))
+            assert whole == per_line, pattern
+
+
+class DescribeLiteralPrefilter:
+    """Tests for LiteralPrefilter."""
+
+    def it_keeps_every_pattern_that_may_match(self):
+        """Should never skip a pattern that matches the text."""
+        from comby_skill._regex import LiteralPrefilter
+
+        patterns = ["admin", "admın", "admİn", "colou?r_name", "foo|bar", r"\d+", "(?i:token)_key"]
+        texts = [
+            "ADMIN", "admın", "ADMİN", "Colr_Name", "colour_name", "FOO",
+            "42", "TOKEN_KEY", "token_KEY", "nothing here",
+        ]
+        for flags in (0, re.IGNORECASE):
+            prefilter = LiteralPrefilter(patterns, flags)
+            for text in texts:
+                matching = [i for i, pattern in enumerate(patterns) if re.search(pattern, text, flags)]
+                candidates = prefilter.candidates(text)
+                assert set(matching) <= set(candidates), (flags, text)
+                assert candidates == sorted(candidates)
+
+    def it_skips_patterns_whose_literal_is_absent(self):
+        """Should drop only patterns with a long enough literal missing from the text."""
+        from comby_skill._regex import LiteralPrefilter
+
+        prefilter = LiteralPrefilter(["admin", "admın", "foo|bar", "ab"], re.IGNORECASE)
+        assert prefilter.candidates("nothing here") == [2, 3]
+        assert prefilter.candidates("ADMİN") == [0, 1, 2, 3]
+
+
+class DescribeRe2Backend:
+    """Tests for the choice between RE2 and the stdlib engine."""
+
+    CASES = [
+        # (pattern, flags, RE2 matches alike)
+        ("hello", 0, True),
+        (r"def\s+", 0, False),
+        (r"\w+", 0, False),
+        (r"\d", 0, False),
+        (r"[\w.]", 0, False),
+        (r"\bdef\b", 0, False),
+        (r"\Bdef", 0, False),
+        ("[a-z]+_[0-9]", 0, True),
+        ("end$", 0, False),
+        ("end$", re.MULTILINE, True),
+        ("(?m)end$", 0, True),
+        ("token", re.IGNORECASE, True),
+        ("admin", re.IGNORECASE, False),
+        ("(?i:admin)", 0, False),
+        ("[a-z]+", re.IGNORECASE, False),
+        ("admin", 0, True),
+        ("x*", 0, False),
+        ("(?=a)b", 0, False),
+        (r"(a)\1", 0, False),
+    ]
+
+    TEXTS = [
+        "café déf def\v end\nADMİN admın token\u2003x ٣ 42\nend",
+        "plain_ascii_1 end",
+    ]
+
+    def it_leaves_unicode_sensitive_patterns_to_re(self):
+        """Should only hand RE2 patterns it matches exactly as re does."""
+        from comby_skill._regex import re2_matches_alike
+
+        for pattern, flags, alike in self.CASES:
+            assert re2_matches_alike(pattern, flags) == alike, pattern
+
+    def it_matches_like_re_with_re2_installed(self):
+        """Should give the same matches on non-ASCII text with RE2 installed."""
+        pytest.importorskip("re2")
+        from comby_skill._regex import compile_pattern
+
+        assert not isinstance(compile_pattern("hello"), re.Pattern)
+        assert isinstance(compile_pattern(r"\w+"), re.Pattern)
+
+        for pattern, flags, _ in self.CASES:
+            compiled = compile_pattern(pattern, flags)
+            for text in self.TEXTS:
+                expected = [match.span() for match in re.finditer(pattern, text, flags)]
+                assert [match.span() for match in compiled.finditer(text)] == expected, pattern
+
+                data = text.encode()
+                if pattern.isascii():
+                    compiled_bytes = compile_pattern(pattern.encode(), flags)
+                    expected = [match.span() for match in re.finditer(pattern.encode(), data, flags)]
+                    assert [match.span() for match in compiled_bytes.finditer(data)] == expected, pattern
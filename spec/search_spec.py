@@ -201,6 +201,38 @@ with describe("CLI search command") as it:
             # With context enabled, result should include context in JSON output
             data = json.loads(result.stdout) if "-f json" in "search -C 1 hello" else None
 
+    with it("search - reports line and column of each match") as test:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "test.py"
+            test_file.write_text('x = 1\n\n  hello hello\nhello\n')
+
+            for pattern in ("hello", r"hello\s*"):
+                result = subprocess.run(
+                    ["python", "-m", "comby_skill.cli", "search", "-f", "json", pattern, tmpdir],
+                    capture_output=True,
+                    text=True,
+                )
+
+                test.assertEqual(result.returncode, 0)
+                data = json.loads(result.stdout)
+                positions = [(m["line"], m["column"]) for m in data["matches"]]
+                test.assertEqual(positions, [(3, 3), (3, 9), (4, 1)])
+
+    with it("search - honours inline flags when skipping files") as test:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.py").write_text('say("Hello")\n')
+            (Path(tmpdir) / "b.py").write_text('pass\n')
+
+            for pattern, expected in (("Hello", 1), ("(?i)HELLO", 1), ("(?i:HELLO)", 1), ("HELLO", 0)):
+                result = subprocess.run(
+                    ["python", "-m", "comby_skill.cli", "search", "-f", "json", pattern, tmpdir],
+                    capture_output=True,
+                    text=True,
+                )
+
+                test.assertEqual(result.returncode, 0)
+                test.assertEqual(len(json.loads(result.stdout)["matches"]), expected)
+
     with it("search - default format shows summary") as test:
         with tempfile.TemporaryDirectory() as tmpdir:
             test_file = Path(tmpdir) / "test.py"
@@ -215,3 +247,84 @@ with describe("CLI search command") as it:
             test.assertEqual(result.returncode, 0)
             test.assertIn("Total:", result.stdout)
             test.assertIn("match", result.stdout)
+
+    with it("search - gives the same results with and without worker processes") as test:
+        from comby_skill.search_engine import SearchEngine
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(300):
+                Path(tmpdir).joinpath(f"f{i:03}.py").write_text('hello\n' * (i % 3))
+
+            engine = SearchEngine("hello")
+            serial = engine.search(tmpdir, max_results=10_000, max_workers=1)
+            parallel = engine.search(tmpdir, max_results=10_000, max_workers=2)
+            test.assertEqual(
+                [(str(r.file_path), r.line_number) for r in parallel],
+                [(str(r.file_path), r.line_number) for r in serial],
+            )
+            test.assertEqual(len(engine.search(tmpdir, max_results=5, max_workers=2)), 5)
+            test.assertEqual(engine.count_matches(tmpdir, max_workers=1), len(serial))
+            test.assertEqual(engine.count_matches(tmpdir, max_workers=2), len(serial))
+
+    with it("search - streams files above the chunk size with whole-file results") as test:
+        import re
+        from comby_skill.search_engine import SearchEngine, _STREAM_BYTES
+
+        def expected(path, pattern):
+            with open(path, encoding="utf-8") as f:
+                return [
+                    (line_num, match.start() + 1, match.group())
+                    for line_num, line in enumerate(f.read().split("\n"), 1)
+                    for match in re.finditer(pattern, line)
+                ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, newline in (("lf.py", b"\n"), ("crlf.py", b"\r\n")):
+                line = "x = 1 # \u00e9".encode() + newline
+                data = bytearray()
+                while len(data) + len(line) < _STREAM_BYTES - 100:
+                    data += line
+                # The first chunk boundary cuts "hello", the second a \r\n pair
+                data += b"a" * (_STREAM_BYTES - 3 - len(data)) + b"hello world" + newline
+                while len(data) + len(line) < 2 * _STREAM_BYTES - 100:
+                    data += line
+                data += b"b" * (2 * _STREAM_BYTES - 6 - len(data)) + b"hello\r\n"
+                data += b"last hello" + newline
+                path = Path(tmpdir) / name
+                path.write_bytes(bytes(data))
+
+                for pattern in ("hello", r"a+hello", r"o\s*$"):
+                    results = SearchEngine(pattern)._search_file(path, max_results=10_000)
+                    test.assertEqual(
+                        [(r.line_number, r.column_number, r.matched_text) for r in results],
+                        expected(path, pattern),
+                    )
+                    test.assertTrue(results)
+
+    with it("search - skips streamed files that are not UTF-8 past the results limit") as test:
+        from comby_skill.search_engine import SearchEngine, _STREAM_BYTES
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "big.py"
+            path.write_bytes(b"hello\n" * (_STREAM_BYTES // 3) + b"\xff\n")
+
+            engine = SearchEngine("hello")
+            test.assertEqual(len(engine._search_file(path, max_results=5)), 0)
+            test.assertEqual(engine.count_matches(tmpdir, max_workers=1), 0)
+
+            path.write_bytes(b"hello\n" * (_STREAM_BYTES // 3))
+            test.assertEqual(len(engine._search_file(path, max_results=5)), 5)
+            test.assertEqual(engine.count_matches(tmpdir, max_workers=1), _STREAM_BYTES // 3)
+
+    with it("search - matches non-ASCII text the same with and without RE2") as test:
+        from comby_skill.search_engine import SearchEngine
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.py"
+            path.write_text("café = naïve_value\nprint(café)\n", encoding="utf-8")
+
+            for use_re2 in (False, True):
+                for pattern, expected in ((r"\w+é", ["café", "café"]), (r"\bnaïve\w*", ["naïve_value"])):
+                    engine = SearchEngine(pattern, use_re2=use_re2)
+                    results = engine._search_file(path, max_results=100)
+                    test.assertEqual([r.matched_text for r in results], expected)
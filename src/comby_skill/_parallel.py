@@ -0,0 +1,10 @@
+"""Worker process helpers shared by the pattern families and the search engine."""
+
+import os
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
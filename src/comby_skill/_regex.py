@@ -0,0 +1,618 @@
+"""Regex backend shared by the pattern families and the search engine.
+
+google-re2 guarantees linear-time matching and is preferred when it is
+installed. Patterns outside RE2's syntax (lookarounds, backreferences),
+patterns RE2 would match differently (Unicode ``\\w``, ``\\d``, ``\\s``, ``\\b``)
+and environments without the package fall back to the stdlib ``re`` engine.
+
+Hyperscan, when installed, lets a PatternSet find out in a single pass
+which of its patterns occur in a text at all. Without it, a literal
+prefilter (Aho-Corasick via pyahocorasick when installed) skips patterns
+whose required literal text is absent.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# The stdlib regex parser is private; without it no pattern is analyzed
+# (no literals, nothing line-local), which only costs speed
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Shorter literals are too common in source code to filter anything out
+MIN_LITERAL_LENGTH = 3
+
+# IGNORECASE matches both Turkish i's against ``i``, but casefold keeps the
+# dotless one and turns the dotted one into two characters
+_DOTTED_I_FOLDS = str.maketrans({"\u0130": "i", "\u0131": "i"})
+
+
+_RE2_INLINE_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+)
+
+
+def compile_pattern(pattern: Union[str, bytes], flags: int = 0):
+    """Compile a regex, preferring RE2 when available.
+
+    RE2 is only used for patterns it matches exactly as ``re`` does (see
+    re2_matches_alike), so results never depend on whether it is installed.
+
+    Args:
+        pattern: Regex pattern (a bytes pattern matches bytes-like objects)
+        flags: ``re`` flags (IGNORECASE, MULTILINE and DOTALL are honoured by RE2)
+
+    Returns:
+        Compiled pattern exposing the ``re.Pattern`` matching API
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    if (
+        re2 is not None
+        and not flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        and re2_matches_alike(pattern, flags)
+    ):
+        inline = "".join(letter for flag, letter in _RE2_INLINE_FLAGS if flags & flag)
+        if inline:
+            prefix = f"(?{inline})"
+            pattern = (prefix.encode() if isinstance(pattern, bytes) else prefix) + pattern
+        try:
+            if isinstance(pattern, bytes):
+                # Byte for byte, as ``re`` matches bytes, rather than as UTF-8
+                options = re2.Options()
+                options.encoding = re2.Options.Encoding.LATIN1
+                return re2.compile(pattern, options)
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+
+    return re.compile(pattern, flags)
+
+
+def re2_matches_alike(pattern: Union[str, bytes], flags: int = 0) -> bool:
+    """Tell whether RE2 matches a pattern exactly as the stdlib engine does.
+
+    RE2's ``\\w``, ``\\d``, ``\\s`` and ``\\b`` are ASCII-only (its ``\\s`` also
+    leaves out ``\\v``), its ``$`` only matches at the very end outside
+    MULTILINE mode, and its IGNORECASE does not pair ``i`` and ``I`` with
+    the Turkish dotted and dotless i's. Its finditer also steps over empty
+    matches differently. Patterns using any of these, patterns that can
+    match empty text, and syntax RE2 lacks are left to ``re``.
+
+    Args:
+        pattern: Regex pattern
+        flags: ``re`` flags the pattern is compiled with
+
+    Returns:
+        True if RE2 gives the same matches; False if unsure
+    """
+    if sre_parse is None:
+        return False
+
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return False
+
+    try:
+        if parsed.getwidth()[0] == 0:
+            return False
+        return _re2_alike(
+            parsed,
+            bool(parsed.state.flags & re.IGNORECASE),
+            bool(parsed.state.flags & re.MULTILINE),
+        )
+    except RecursionError:
+        return False
+
+
+def _re2_alike(subpattern, ignorecase: bool, multiline: bool) -> bool:
+    """Check every node of a parsed pattern for re2_matches_alike."""
+    for op, av in subpattern:
+        if op is sre_parse.LITERAL or op is sre_parse.NOT_LITERAL:
+            if ignorecase and av in _TURKISH_I:
+                return False
+        elif op is sre_parse.RANGE:
+            if ignorecase and any(av[0] <= code <= av[1] for code in _TURKISH_I):
+                return False
+        elif op is sre_parse.IN:
+            if not _re2_alike(av, ignorecase, multiline):
+                return False
+        elif op is sre_parse.AT:
+            if av not in _RE2_ANCHORS and not (multiline and av is sre_parse.AT_END):
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, child = av
+            child_ignorecase = bool(add_flags & re.IGNORECASE) or (ignorecase and not del_flags & re.IGNORECASE)
+            child_multiline = bool(add_flags & re.MULTILINE) or (multiline and not del_flags & re.MULTILINE)
+            if not _re2_alike(child, child_ignorecase, child_multiline):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_re2_alike(branch, ignorecase, multiline) for branch in av[1]):
+                return False
+        elif op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT:
+            if not _re2_alike(av[2], ignorecase, multiline):
+                return False
+        elif op is not sre_parse.ANY and op is not sre_parse.NEGATE:
+            # Categories (\w, \d, \s), lookarounds, backreferences and
+            # anything else unknown here
+            return False
+
+    return True
+
+
+def compile_family(patterns: Dict[str, List[str]], flags: int = 0) -> Dict[str, list]:
+    """Compile a ``{key: [pattern, ...]}`` pattern table.
+
+    Args:
+        patterns: Pattern lists keyed by language or framework
+        flags: ``re`` flags applied to every pattern
+
+    Returns:
+        Dictionary with the same keys and compiled patterns
+    """
+    return {
+        key: [compile_pattern(p, flags) for p in pattern_list]
+        for key, pattern_list in patterns.items()
+    }
+
+
+class LineIndex:
+    """Maps character offsets in a text to 1-indexed line numbers.
+
+    Newline offsets are recorded on the first lookup, so creating an index
+    for a text that ends up without matches costs nothing.
+    """
+
+    def __init__(self, text: str):
+        """Create an index over a text.
+
+        Args:
+            text: Text the offsets refer to
+        """
+        self._text = text
+        self._newlines = None
+
+    @property
+    def newlines(self) -> List[int]:
+        """Sorted offsets of every newline in the text."""
+        if self._newlines is None:
+            newlines = []
+            text = self._text
+            position = text.find('\n')
+            while position != -1:
+                newlines.append(position)
+                position = text.find('\n', position + 1)
+            self._newlines = newlines
+            self._text = None
+        return self._newlines
+
+    def line_number(self, offset: int) -> int:
+        """Return the line containing a character offset.
+
+        Args:
+            offset: Character offset into the text
+
+        Returns:
+            1-indexed line number
+        """
+        return bisect_left(self.newlines, offset) + 1
+
+
+class PatternSet:
+    """An ordered group of patterns scanned over the same text.
+
+    ``finditer`` yields exactly what looping ``finditer`` over each pattern
+    in order would. With Hyperscan available, one pass over the text first
+    determines which patterns occur, and the others are skipped entirely.
+    """
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        """Compile the patterns.
+
+        Args:
+            patterns: Regex patterns, in result order
+            flags: ``re`` flags applied to every pattern
+        """
+        self.patterns = list(patterns)
+        self.compiled = [compile_pattern(p, flags) for p in self.patterns]
+        self._database, self._always_run = _build_hyperscan_database(self.patterns, flags)
+        self._prefilter = None if self._database is not None else LiteralPrefilter(self.patterns, flags)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def candidates(self, text: str) -> List[int]:
+        """Return indices of the patterns that may match the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Sorted pattern indices
+        """
+        if self._database is None:
+            return self._prefilter.candidates(text)
+
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:
+            # Lone surrogates are not valid UTF-8 input for Hyperscan
+            return list(range(len(self.patterns)))
+
+        hits = set(self._always_run)
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+
+        self._database.scan(data, match_event_handler=on_match)
+        return sorted(hits)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, "re.Match"]]:
+        """Find matches of every pattern.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (pattern index, match) tuples, grouped by pattern in order
+        """
+        for index in self.candidates(text):
+            for match in self.compiled[index].finditer(text):
+                yield index, match
+
+
+class LiteralPrefilter:
+    """Skips patterns whose required literal does not occur in a text.
+
+    Each pattern's longest required literal is found with the stdlib regex
+    parser. Matching is case-insensitive (both sides casefolded), so it is
+    safe for IGNORECASE patterns. Patterns without a usable literal are
+    always candidates.
+    """
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        """Extract the literal of every pattern.
+
+        Args:
+            patterns: Regex patterns
+            flags: ``re`` flags the patterns are compiled with
+        """
+        self._pattern_count = len(patterns)
+        self._always_run = []
+        self._by_literal = {}
+
+        for index, pattern in enumerate(patterns):
+            literal = required_literal(pattern, flags)
+            if literal is None or len(literal) < MIN_LITERAL_LENGTH:
+                self._always_run.append(index)
+            else:
+                self._by_literal.setdefault(_fold(literal), []).append(index)
+
+        self._automaton = None
+        if ahocorasick is not None and self._by_literal:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self._by_literal:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
+    def candidates(self, text: str) -> List[int]:
+        """Return indices of the patterns that may match the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Sorted pattern indices
+        """
+        if not self._by_literal:
+            return list(range(self._pattern_count))
+
+        folded = _fold(text)
+        if self._automaton is not None:
+            found = {literal for _, literal in self._automaton.iter(folded)}
+        else:
+            found = {literal for literal in self._by_literal if literal in folded}
+
+        hits = list(self._always_run)
+        for literal in found:
+            hits.extend(self._by_literal[literal])
+        return sorted(hits)
+
+
+def _fold(text: str) -> str:
+    """Casefold text so that IGNORECASE-equal strings fold alike."""
+    if "\u0130" in text or "\u0131" in text:
+        text = text.translate(_DOTTED_I_FOLDS)
+    return text.casefold()
+
+
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """Return the longest literal text every match of a pattern contains.
+
+    Only literal runs at the top level of the pattern, inside groups, or
+    inside repeats of at least one are considered; alternations are
+    skipped, and so are ``(?i:...)`` groups. A pattern made case-insensitive
+    by an inline ``(?i)`` has no literal unless ``flags`` has IGNORECASE
+    (callers then compare casefolded text). The result may be shorter than
+    what is truly required, never wrong.
+
+    Args:
+        pattern: Regex pattern
+        flags: ``re`` flags the pattern is compiled with
+
+    Returns:
+        Literal text, or None if the pattern has none (or does not parse)
+    """
+    if sre_parse is None:
+        return None
+
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return None
+
+    # An inline (?i) makes the whole pattern case-insensitive
+    if parsed.state.flags & re.IGNORECASE and not flags & re.IGNORECASE:
+        return None
+
+    runs = _literal_runs(parsed)
+    return max(runs, key=len) if runs else None
+
+
+def literal_prefix(pattern: str, flags: int = 0) -> str:
+    """Return the literal text every match of a pattern starts with.
+
+    Args:
+        pattern: Regex pattern
+        flags: ``re`` flags the pattern is compiled with
+
+    Returns:
+        Literal prefix, empty if there is none or the pattern is
+        case-insensitive (or does not parse)
+    """
+    if sre_parse is None:
+        return ""
+
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return ""
+
+    if parsed.state.flags & re.IGNORECASE:
+        return ""
+
+    prefix = []
+    for op, av in parsed:
+        if op is not sre_parse.LITERAL:
+            break
+        prefix.append(chr(av))
+    return "".join(prefix)
+
+
+def _literal_runs(subpattern) -> List[str]:
+    """Collect runs of consecutive required literals from a parsed pattern."""
+    runs = []
+    current = []
+
+    def flush():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    for op, av in subpattern:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            # (?i:...) scoped groups, av being (group, add_flags, del_flags, p)
+            if not av[1] & re.IGNORECASE:
+                runs.extend(_literal_runs(av[-1]))
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            runs.extend(_literal_runs(av[2]))
+        elif op is _ATOMIC_GROUP:
+            runs.extend(_literal_runs(av))
+
+    flush()
+    return runs
+
+
+_REPEAT_OPS = tuple(
+    op for op in (
+        getattr(sre_parse, "MAX_REPEAT", None),
+        getattr(sre_parse, "MIN_REPEAT", None),
+        getattr(sre_parse, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+)
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+
+
+def is_line_local(pattern: str, flags: int = 0) -> bool:
+    """Tell whether a pattern can be run over a whole text instead of per line.
+
+    A pattern is line-local when no match can contain a newline and its
+    anchors mean the same per line as in MULTILINE mode over the whole
+    text: ``^``, ``$`` and ``\\b`` do, while ``\\A``, ``\\Z`` and ``\\B`` (which
+    never matches an empty line) do not. Scanning the whole text with
+    ``re.MULTILINE`` then finds exactly the matches that scanning each line
+    separately would.
+
+    Args:
+        pattern: Regex pattern
+        flags: ``re`` flags the pattern is compiled with
+
+    Returns:
+        True if the pattern is line-local; False if unsure
+    """
+    if sre_parse is None:
+        return False
+
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return False
+
+    try:
+        return _is_line_local(parsed, bool(parsed.state.flags & re.DOTALL))
+    except RecursionError:
+        return False
+
+
+def _is_line_local(subpattern, dotall: bool) -> bool:
+    """Check every node of a parsed pattern for is_line_local."""
+    for op, av in subpattern:
+        if op is sre_parse.LITERAL:
+            if av == _NEWLINE:
+                return False
+        elif op is sre_parse.NOT_LITERAL:
+            if av != _NEWLINE:
+                return False
+        elif op is sre_parse.ANY:
+            if dotall:
+                return False
+        elif op is sre_parse.IN:
+            if _set_contains_newline(av):
+                return False
+        elif op is sre_parse.AT:
+            if av not in _LINE_LOCAL_ANCHORS:
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, child = av
+            if add_flags & re.DOTALL:
+                child_dotall = True
+            elif del_flags & re.DOTALL:
+                child_dotall = False
+            else:
+                child_dotall = dotall
+            if not _is_line_local(child, child_dotall):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_is_line_local(branch, dotall) for branch in av[1]):
+                return False
+        elif op in _REPEAT_OPS:
+            if not _is_line_local(av[2], dotall):
+                return False
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if not _is_line_local(av[1], dotall):
+                return False
+        elif op is sre_parse.GROUPREF_EXISTS:
+            _, yes, no = av
+            if not _is_line_local(yes, dotall) or (no is not None and not _is_line_local(no, dotall)):
+                return False
+        elif op is _ATOMIC_GROUP:
+            if not _is_line_local(av, dotall):
+                return False
+        elif op is not sre_parse.GROUPREF:
+            # Backreferences repeat text of the same match; anything else is
+            # unknown here
+            return False
+
+    return True
+
+
+def _set_contains_newline(items) -> bool:
+    """Tell whether a parsed character set matches a newline."""
+    negate = False
+    contains = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            contains = contains or av == _NEWLINE
+        elif op is sre_parse.RANGE:
+            contains = contains or av[0] <= _NEWLINE <= av[1]
+        elif op is sre_parse.CATEGORY:
+            contains = contains or av in _NEWLINE_CATEGORIES
+        else:
+            # Unknown set item: assume the worst
+            return True
+    return contains != negate
+
+
+# Code points IGNORECASE pairs differently in RE2: i, I, İ and ı
+_TURKISH_I = (ord("I"), ord("i"), 0x130, 0x131)
+_RE2_ANCHORS = tuple(
+    getattr(sre_parse, name, None) for name in ("AT_BEGINNING", "AT_BEGINNING_STRING")
+)
+
+_NEWLINE = ord("\n")
+_LINE_LOCAL_ANCHORS = tuple(
+    getattr(sre_parse, name, None) for name in ("AT_BEGINNING", "AT_END", "AT_BOUNDARY")
+)
+_NEWLINE_CATEGORIES = tuple(
+    getattr(sre_parse, name, None)
+    for name in ("CATEGORY_SPACE", "CATEGORY_NOT_DIGIT", "CATEGORY_NOT_WORD", "CATEGORY_LINEBREAK")
+)
+
+
+def _build_hyperscan_database(patterns: List[str], flags: int):
+    """Compile patterns into a Hyperscan prefilter database.
+
+    Patterns are compiled in prefilter mode, so Hyperscan may report false
+    positives but never misses a pattern that ``re`` would match. Patterns
+    Hyperscan rejects are always run.
+
+    Returns:
+        (database or None, indices of patterns that always run)
+    """
+    if hyperscan is None or not patterns:
+        return None, []
+
+    hs_flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | \
+        hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_ALLOWEMPTY
+    if flags & re.IGNORECASE:
+        hs_flags |= hyperscan.HS_FLAG_CASELESS
+    if flags & re.DOTALL:
+        hs_flags |= hyperscan.HS_FLAG_DOTALL
+    if flags & re.MULTILINE:
+        hs_flags |= hyperscan.HS_FLAG_MULTILINE
+
+    supported = []
+    always_run = []
+    for index, pattern in enumerate(patterns):
+        try:
+            probe = hyperscan.Database()
+            probe.compile(expressions=[pattern.encode("utf-8")], ids=[index], elements=1, flags=[hs_flags])
+            supported.append(index)
+        except hyperscan.error:
+            always_run.append(index)
+
+    if not supported:
+        return None, []
+
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[patterns[i].encode("utf-8") for i in supported],
+        ids=supported,
+        elements=len(supported),
+        flags=[hs_flags] * len(supported),
+    )
+    return database, always_run
@@ -13,6 +13,7 @@ from .database_access import (
 from .http_endpoints import (
     HTTPEndpoint,
     HTTPMethod,
+    Framework,
     HTTPEndpointPatterns,
     detect_http_endpoints,
     classify_endpoints,
@@ -66,6 +67,7 @@ __all__ = [
     # HTTP
     "HTTPEndpoint",
     "HTTPMethod",
+    "Framework",
     "detect_http_endpoints",
     "classify_endpoints",
 
@@ -0,0 +1,76 @@
+"""
+Content-addressed result cache for the pattern detectors.
+
+Editors and hooks re-run detectors on files that have not changed; keying
+results on a digest of the content lets those calls skip every regex.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+
+def cache_by_content(maxsize: int = 4096) -> Callable:
+    """Memoize a ``detector(file_path, language, code_content)`` function.
+
+    Results are keyed on (file_path, language, BLAKE2b digest of the
+    content), so the cache never holds on to file contents. The cache keeps
+    its own copy of the results and every call returns new result objects
+    with new list, dict and set fields, so callers may mutate what they get
+    back. The values inside those containers are shared, so detectors must
+    only put immutable values (strings, numbers, enums) in them.
+
+    Args:
+        maxsize: Maximum number of cached files (least recently used evicted)
+
+    Returns:
+        Decorator adding the cache and a ``cache_clear()`` method
+    """
+    def decorator(detector: Callable) -> Callable:
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(detector)
+        def wrapper(file_path: str, language: str, code_content: str):
+            digest = hashlib.blake2b(
+                code_content.encode("utf-8", "surrogatepass"),
+                digest_size=16,
+            ).digest()
+            key = (file_path, language, digest)
+
+            with lock:
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+            if cached is not None:
+                return [_copy_result(result) for result in cached]
+
+            results = detector(file_path, language, code_content)
+            stored = tuple(_copy_result(result) for result in results)
+
+            with lock:
+                cache[key] = stored
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return results
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def _copy_result(result):
+    """Copy a result object and the mutable containers it holds."""
+    clone = object.__new__(type(result))
+    fields = clone.__dict__
+    for name, value in result.__dict__.items():
+        fields[name] = value.copy() if isinstance(value, (list, dict, set)) else value
+    return clone
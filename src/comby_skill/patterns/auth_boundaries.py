@@ -9,10 +9,15 @@ Detects and classifies:
 - Password handling
 """
 
+import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+from comby_skill._regex import LineIndex, PatternSet, compile_family
+from comby_skill.patterns._cache import cache_by_content
+
 
 class AuthType(Enum):
     """Types of authentication/authorization patterns."""
@@ -175,6 +180,58 @@ class AuthPatterns:
     }
 
 
+# Boundary pattern tables in detection order
+_BOUNDARY_FAMILIES = (
+    ("AUTH_DECORATORS", AuthType.DECORATOR),
+    ("AUTH_MIDDLEWARE", AuthType.MIDDLEWARE),
+    ("JWT_PATTERNS", AuthType.JWT_HANDLER),
+    ("OAUTH_PATTERNS", AuthType.OAUTH_HANDLER),
+    ("PASSWORD_PATTERNS", AuthType.PASSWORD_HANDLER),
+    ("PERMISSION_PATTERNS", AuthType.PERMISSION_CHECK),
+)
+
+# Fixed boundary names; decorators and permission checks use the matched text
+_BOUNDARY_NAMES = {
+    AuthType.MIDDLEWARE: "auth_middleware",
+    AuthType.JWT_HANDLER: "jwt_handler",
+    AuthType.OAUTH_HANDLER: "oauth_handler",
+    AuthType.PASSWORD_HANDLER: "password_handler",
+}
+
+# Password handling that goes through a proper hashing scheme
+_SECURE_HASH_MARKERS = ("bcrypt", "argon2", "hashpw")
+
+
+def _build_boundary_sets() -> Dict[str, tuple]:
+    """Build one PatternSet per language over every boundary family.
+
+    Returns:
+        Dictionary of language -> (PatternSet, AuthType per pattern)
+    """
+    languages = {
+        language
+        for family, _ in _BOUNDARY_FAMILIES
+        for language in getattr(AuthPatterns, family)
+    }
+
+    boundary_sets = {}
+    for language in sorted(languages):
+        patterns = []
+        auth_types = []
+        for family, auth_type in _BOUNDARY_FAMILIES:
+            family_patterns = getattr(AuthPatterns, family).get(language, [])
+            patterns.extend(family_patterns)
+            auth_types.extend([auth_type] * len(family_patterns))
+        boundary_sets[language] = (PatternSet(patterns, re.IGNORECASE), auth_types)
+
+    return boundary_sets
+
+
+_BOUNDARY_SETS = _build_boundary_sets()
+_INSECURE_COMPILED = compile_family(AuthPatterns.INSECURE_PATTERNS, re.IGNORECASE)
+
+
+@cache_by_content()
 def detect_auth_boundaries(
     file_path: str,
     language: str,
@@ -182,6 +239,9 @@ def detect_auth_boundaries(
 ) -> List[AuthBoundary]:
     """Detect authentication/authorization boundaries in code.
 
+    Results are cached by content; unchanged files return copies of the
+    cached boundaries without re-running the patterns.
+
     Args:
         file_path: Path to the file being analyzed
         language: Programming language
@@ -190,101 +250,109 @@ def detect_auth_boundaries(
     Returns:
         List of detected auth boundaries
     """
-    import re
     results = []
 
-    # Check decorators
-    for pattern in AuthPatterns.AUTH_DECORATORS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.DECORATOR,
-                name=match.group(0)[:50],
-                context=match.group(0),
-            ))
-
-    # Check middleware
-    for pattern in AuthPatterns.AUTH_MIDDLEWARE.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.MIDDLEWARE,
-                name="auth_middleware",
-                context=match.group(0),
-            ))
-
-    # Check JWT
-    for pattern in AuthPatterns.JWT_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.JWT_HANDLER,
-                name="jwt_handler",
-                context=match.group(0),
-            ))
-
-    # Check OAuth
-    for pattern in AuthPatterns.OAUTH_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.OAUTH_HANDLER,
-                name="oauth_handler",
-                context=match.group(0),
-            ))
-
-    # Check password handling
-    for pattern in AuthPatterns.PASSWORD_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
+    if language not in _BOUNDARY_SETS:
+        return results
+
+    pattern_set, auth_types = _BOUNDARY_SETS[language]
+    line_index = LineIndex(code_content)
 
+    for index, match in pattern_set.finditer(code_content):
+        auth_type = auth_types[index]
+        text = match.group(0)
+        line_num = line_index.line_number(match.start())
+
+        # Slicing a str no longer than the bound returns the same object
+        is_secure = True
+        if auth_type is AuthType.DECORATOR:
+            name = text[:50]
+        elif auth_type is AuthType.PERMISSION_CHECK:
+            name = text[:30]
+        else:
+            name = _BOUNDARY_NAMES[auth_type]
+
+        if auth_type is AuthType.PASSWORD_HANDLER:
             # Check if secure (uses proper hashing)
-            is_secure = 'bcrypt' in match.group(0).lower() or \
-                       'argon2' in match.group(0).lower() or \
-                       'hashpw' in match.group(0).lower()
-
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.PASSWORD_HANDLER,
-                name="password_handler",
-                context=match.group(0),
-                is_secure=is_secure,
-            ))
-
-    # Check permissions
-    for pattern in AuthPatterns.PERMISSION_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-            results.append(AuthBoundary(
-                file_path=file_path,
-                line_number=line_num,
-                auth_type=AuthType.PERMISSION_CHECK,
-                name=match.group(0)[:30],
-                context=match.group(0),
-            ))
+            lowered = text.lower()
+            is_secure = any(marker in lowered for marker in _SECURE_HASH_MARKERS)
+
+        results.append(AuthBoundary(
+            file_path=file_path,
+            line_number=line_num,
+            auth_type=auth_type,
+            name=name,
+            context=text,
+            is_secure=is_secure,
+        ))
 
     # Check for insecure patterns
-    for boundary in results:
-        boundary.issues = check_insecure_patterns(language, code_content, boundary.line_number)
+    if results:
+        _attach_insecure_issues(results, language, code_content, line_index)
 
     return results
 
 
+def _attach_insecure_issues(
+    results: List[AuthBoundary],
+    language: str,
+    code_content: str,
+    line_index: LineIndex,
+) -> None:
+    """Attach nearby insecure-pattern issues to each boundary.
+
+    Gives each boundary what check_insecure_patterns gives for its line,
+    the insecure patterns found in the five-line window around it. Each
+    pattern runs over the file once and its match offsets are bisected
+    into the windows. The patterns have no anchors, so a match inside a
+    window is a match of the window, and a window that no match overlaps
+    has none. Only a window overlapped just by matches running past its
+    edges, which may hide one inside it, is searched on its own.
+
+    Args:
+        results: Detected boundaries, updated in place
+        language: Programming language
+        code_content: Source code content
+        line_index: Line index of code_content
+    """
+    newlines = line_index.newlines
+    windows = {}
+    for boundary in results:
+        line_number = boundary.line_number
+        if line_number not in windows:
+            # 0-indexed lines line_number-3 .. line_number+1
+            first = line_number - 3
+            last = line_number + 1
+            start = newlines[first - 1] + 1 if first > 0 else 0
+            end = newlines[last] if last < len(newlines) else len(code_content)
+            windows[line_number] = (start, end)
+
+    issues_by_line = {line_number: [] for line_number in windows}
+    for pattern, compiled in zip(
+        AuthPatterns.INSECURE_PATTERNS.get(language, []),
+        _INSECURE_COMPILED.get(language, []),
+    ):
+        spans = [match.span() for match in compiled.finditer(code_content)]
+        if not spans:
+            continue
+        # Matches don't overlap, so their ends are sorted like their starts
+        starts = [span[0] for span in spans]
+        ends = [span[1] for span in spans]
+        issue = f"Potential security issue: {pattern}"
+        for line_number, (start, end) in windows.items():
+            # Matches overlapping the window are spans[lo:hi]
+            lo = bisect_right(ends, start)
+            hi = bisect_left(starts, end)
+            if lo >= hi:
+                continue
+            inside = max(lo, bisect_left(starts, start))
+            if (inside < hi and ends[inside] <= end) or compiled.search(code_content[start:end]):
+                issues_by_line[line_number].append(issue)
+
+    for boundary in results:
+        boundary.issues = list(issues_by_line[boundary.line_number])
+
+
 def check_insecure_patterns(
     language: str,
     code_content: str,
@@ -300,7 +368,6 @@ def check_insecure_patterns(
     Returns:
         List of security issues
     """
-    import re
     issues = []
 
     lines = code_content.split('\n')
@@ -310,8 +377,9 @@ def check_insecure_patterns(
 
     context = '\n'.join(lines[max(0, line_number-3):min(len(lines), line_number+2)])
 
-    for pattern in AuthPatterns.INSECURE_PATTERNS.get(language, []):
-        if re.search(pattern, context, re.IGNORECASE):
+    insecure = AuthPatterns.INSECURE_PATTERNS.get(language, [])
+    for pattern, compiled in zip(insecure, _INSECURE_COMPILED.get(language, [])):
+        if compiled.search(context):
             issues.append(f"Potential security issue: {pattern}")
 
     return issues
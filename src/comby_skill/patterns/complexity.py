@@ -9,9 +9,14 @@ Analyzes code complexity metrics including:
 - Cognitive complexity
 """
 
+import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 
+from comby_skill._regex import LineIndex, compile_pattern
+from comby_skill.patterns._cache import cache_by_content
+
 
 @dataclass
 class ComplexityMetric:
@@ -63,6 +68,60 @@ class ComplexityThresholds:
     }
 
 
+# Decision points counted towards cyclomatic complexity
+_DECISION_PATTERNS = [
+    compile_pattern(p, re.IGNORECASE)
+    for p in (
+        r'\bif\b',
+        r'\belif\b',
+        r'\belse\b',
+        r'\bfor\b',
+        r'\bwhile\b',
+        r'\bcatch\b',
+        r'\band\b',
+        r'\bor\b',
+        r'\?[^\n:]*:.*',  # Ternary operator; first ':' after '?' so no backtracking
+    )
+]
+
+# Everything except brackets, stripped before counting nesting depth
+_NON_BRACKETS = compile_pattern(r'[^{}()\[\]]+')
+
+# Substrings that mark a control structure ('elif' is covered by 'if')
+_COGNITIVE_KEYWORDS = compile_pattern(r'if|for|while|catch|case')
+
+# Parameter lists
+# Python: def func(a, b, c)
+# JS: function func(a, b, c)
+# Go: func(a, b, c)
+# etc.
+_PARAMETER_PATTERNS = [
+    compile_pattern(p)
+    for p in (
+        r'def\s+\w+\s*\(([^)]*)\)',
+        r'function\s+\w+\s*\(([^)]*)\)',
+        r'const\s+\w+\s*=\s*\(([^)]*)\)\s*=>',
+        r'func\s+\w+\s*\(([^)]*)\)',
+        r'fn\s+\w+\s*\(([^)]*)\)',
+    )
+]
+
+# Function blocks; the lookaheads are outside RE2 syntax so these use stdlib re
+_FUNCTION_BLOCK_PATTERNS = {
+    language: compile_pattern(pattern, re.DOTALL)
+    for language, pattern in (
+        ("python", r'def\s+(\w+)\s*\(([^)]*)\):(.*?)(?=\ndef\s|\Z)'),
+        ("javascript", r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|(\w+)\s*\([^)]*\)\s*\{)(.*?)(?=\nfunction\s|\nconst\s|\n\w+\s*=\s*|\Z)'),
+        ("go", r'func\s+(?:\([^)]+\)\s+)?(\w+)\s*\(([^)]*)\)\s*\{(.*?)(?=\nfunc\s|\Z)'),
+    )
+}
+_FUNCTION_BLOCK_PATTERNS["typescript"] = _FUNCTION_BLOCK_PATTERNS["javascript"]
+
+# Upper bounds of the low, moderate and high score buckets; anything above is very_high
+_SCORE_BUCKETS = (15, 30, 50)
+_DISTRIBUTION_LABELS = ("low", "moderate", "high", "very_high")
+
+
 def count_cyclomatic_complexity(code_block: str) -> int:
     """Calculate cyclomatic complexity.
 
@@ -72,26 +131,12 @@ def count_cyclomatic_complexity(code_block: str) -> int:
     Returns:
         Cyclomatic complexity value
     """
-    import re
-
     # Base complexity
     complexity = 1
 
     # Count decision points
-    decision_keywords = [
-        r'\bif\b',
-        r'\belif\b',
-        r'\belse\b',
-        r'\bfor\b',
-        r'\bwhile\b',
-        r'\bcatch\b',
-        r'\band\b',
-        r'\bor\b',
-        r'\?.*:.*',  # Ternary operator
-    ]
-
-    for pattern in decision_keywords:
-        complexity += len(re.findall(pattern, code_block, re.IGNORECASE))
+    for pattern in _DECISION_PATTERNS:
+        complexity += len(pattern.findall(code_block))
 
     return complexity
 
@@ -105,17 +150,17 @@ def count_nesting_depth(code_block: str) -> int:
     Returns:
         Maximum nesting depth
     """
-    import re
-
     max_depth = 0
     current_depth = 0
 
-    for char in code_block:
-        if char == '{' or char == '(' or char == '[':
+    # Only bracket characters reach the Python loop
+    for char in _NON_BRACKETS.sub('', code_block):
+        if char in '{([':
             current_depth += 1
-            max_depth = max(max_depth, current_depth)
-        elif char == '}' or char == ')' or char == ']':
-            current_depth = max(0, current_depth - 1)
+            if current_depth > max_depth:
+                max_depth = current_depth
+        elif current_depth:
+            current_depth -= 1
 
     return max_depth
 
@@ -129,24 +174,8 @@ def count_parameters(func_def: str) -> int:
     Returns:
         Number of parameters
     """
-    import re
-
-    # Find parameters in function definition
-    # Python: def func(a, b, c)
-    # JS: function func(a, b, c)
-    # Go: func(a, b, c)
-    # etc.
-
-    patterns = [
-        r'def\s+\w+\s*\(([^)]*)\)',
-        r'function\s+\w+\s*\(([^)]*)\)',
-        r'const\s+\w+\s*=\s*\(([^)]*)\)\s*=>',
-        r'func\s+\w+\s*\(([^)]*)\)',
-        r'fn\s+\w+\s*\(([^)]*)\)',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, func_def)
+    for pattern in _PARAMETER_PATTERNS:
+        match = pattern.search(func_def)
         if match:
             params = match.group(1).strip()
             if not params:
@@ -166,27 +195,24 @@ def calculate_cognitive_complexity(code_block: str) -> int:
     Returns:
         Cognitive complexity value
     """
-    import re
-
     complexity = 0
     nesting_increment = 0
 
     lines = code_block.split('\n')
 
     for line in lines:
-        stripped = line.strip()
-
         # Increment complexity for structures
-        if any(kw in stripped for kw in ['if', 'elif', 'for', 'while', 'catch', 'case']):
+        if _COGNITIVE_KEYWORDS.search(line):
             complexity += 1 + nesting_increment
 
-        if stripped.startswith(('else', 'finally')):
+        if line.lstrip().startswith(('else', 'finally')):
             complexity += 1 + nesting_increment
 
         # Track nesting
-        nesting_increment += line.count('{') - line.count('}')
-        nesting_increment += line.count('(') - line.count(')')
-        nesting_increment += line.count('[') - line.count(']')
+        nesting_increment += (
+            line.count('{') + line.count('(') + line.count('[')
+            - line.count('}') - line.count(')') - line.count(']')
+        )
 
         # Reset negative increments
         if nesting_increment < 0:
@@ -205,31 +231,26 @@ def extract_function_blocks(code_content: str, language: str) -> List[tuple]:
     Returns:
         List of (name, start_line, end_line, code_block) tuples
     """
-    import re
-
     functions = []
 
-    if language == "python":
-        pattern = r'def\s+(\w+)\s*\(([^)]*)\):(.*?)(?=\ndef\s|\Z)'
-    elif language in ("javascript", "typescript"):
-        pattern = r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|(\w+)\s*\([^)]*\)\s*\{)(.*?)(?=\nfunction\s|\nconst\s|\n\w+\s*=\s*|\Z)'
-    elif language == "go":
-        pattern = r'func\s+(?:\([^)]+\)\s+)?(\w+)\s*\(([^)]*)\)\s*\{(.*?)(?=\nfunc\s|\Z)'
-    else:
+    pattern = _FUNCTION_BLOCK_PATTERNS.get(language)
+    if pattern is None:
         return functions
 
-    matches = re.finditer(pattern, code_content, re.DOTALL)
+    line_index = LineIndex(code_content)
+    matches = pattern.finditer(code_content)
     for match in matches:
         name = match.group(1) or match.group(2) or match.group(3)
         code_block = match.group(0)
 
-        start_line = code_content[:match.start()].count('\n') + 1
+        start_line = line_index.line_number(match.start())
 
         functions.append((name, start_line, code_block))
 
     return functions
 
 
+@cache_by_content()
 def analyze_complexity(
     file_path: str,
     language: str,
@@ -237,6 +258,9 @@ def analyze_complexity(
 ) -> List[ComplexityMetric]:
     """Analyze code complexity.
 
+    Results are cached by content; unchanged files return copies of the
+    cached metrics without re-analyzing.
+
     Args:
         file_path: Path to the file
         language: Programming language
@@ -302,40 +326,39 @@ def classify_complexity(metrics: List[ComplexityMetric]) -> Dict[str, Any]:
     if not metrics:
         return classification
 
-    total_score = 0
+    # Aggregate over a single column of scores instead of the metric objects
+    scores = [metric.complexity_score for metric in metrics]
+
+    bucket_counts = [0] * len(_DISTRIBUTION_LABELS)
+    for score in scores:
+        bucket_counts[bisect_right(_SCORE_BUCKETS, score)] += 1
+    classification["complexity_distribution"] = dict(zip(_DISTRIBUTION_LABELS, bucket_counts))
+
+    max_index = max(range(len(scores)), key=scores.__getitem__)
+    if scores[max_index] > 0:
+        max_metric = metrics[max_index]
+        classification["max_complexity"] = scores[max_index]
+        classification["max_complexity_element"] = {
+            "name": max_metric.element_name,
+            "file": max_metric.file_path,
+            "line": max_metric.line_number,
+        }
+
+    classification["average_complexity"] = round(sum(scores) / len(scores), 2)
+
+    # Collect specific issues
+    max_nesting = ComplexityThresholds.NESTING_DEPTH["high"]
+    max_parameters = ComplexityThresholds.PARAMETER_COUNT["high"]
 
     for metric in metrics:
-        score = metric.complexity_score
-        total_score += score
-
-        if score < 15:
-            classification["complexity_distribution"]["low"] += 1
-        elif score < 30:
-            classification["complexity_distribution"]["moderate"] += 1
-        elif score < 50:
-            classification["complexity_distribution"]["high"] += 1
-        else:
-            classification["complexity_distribution"]["very_high"] += 1
-
-        if score > classification["max_complexity"]:
-            classification["max_complexity"] = score
-            classification["max_complexity_element"] = {
-                "name": metric.element_name,
-                "file": metric.file_path,
-                "line": metric.line_number,
-            }
-
-        # Collect specific issues
-        if metric.nesting_depth > ComplexityThresholds.NESTING_DEPTH["high"]:
+        if metric.nesting_depth > max_nesting:
             classification["issues"].append(
                 f"Deep nesting ({metric.nesting_depth}) in {metric.element_name}"
             )
 
-        if metric.parameter_count > ComplexityThresholds.PARAMETER_COUNT["high"]:
+        if metric.parameter_count > max_parameters:
             classification["issues"].append(
                 f"Too many parameters ({metric.parameter_count}) in {metric.element_name}"
             )
 
-    classification["average_complexity"] = round(total_score / len(metrics), 2)
-
     return classification
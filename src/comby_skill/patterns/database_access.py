@@ -8,10 +8,14 @@ Detects and classifies database operations including:
 - Transactions
 """
 
+import re
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+from comby_skill._regex import LineIndex, PatternSet
+from comby_skill.patterns._cache import cache_by_content
+
 
 class DatabaseOperationType(Enum):
     """Types of database operations."""
@@ -97,6 +101,41 @@ class DatabaseAccessPatterns:
     }
 
 
+_RAW_SQL_SETS = {
+    language: PatternSet(patterns, re.IGNORECASE | re.DOTALL)
+    for language, patterns in DatabaseAccessPatterns.RAW_SQL_PATTERNS.items()
+}
+_TRANSACTION_SETS = {
+    language: PatternSet(patterns, re.IGNORECASE)
+    for language, patterns in DatabaseAccessPatterns.TRANSACTION_PATTERNS.items()
+}
+
+# ORM patterns of every framework in one set, with the framework per pattern
+_ORM_FRAMEWORKS = [
+    framework
+    for framework, patterns in DatabaseAccessPatterns.ORM_PATTERNS.items()
+    for _ in patterns
+]
+_ORM_SET = PatternSet(
+    [p for patterns in DatabaseAccessPatterns.ORM_PATTERNS.values() for p in patterns],
+    re.IGNORECASE,
+)
+
+# Keyword -> operation, checked in priority order against the lowercased match
+_RAW_SQL_OPERATIONS = (
+    ("select", DatabaseOperationType.SELECT),
+    ("insert", DatabaseOperationType.INSERT),
+    ("update", DatabaseOperationType.UPDATE),
+    ("delete", DatabaseOperationType.DELETE),
+)
+_ORM_OPERATIONS = (
+    ("create", DatabaseOperationType.INSERT),
+    ("update", DatabaseOperationType.UPDATE),
+    ("delete", DatabaseOperationType.DELETE),
+)
+
+
+@cache_by_content()
 def detect_database_access(
     file_path: str,
     language: str,
@@ -104,6 +143,9 @@ def detect_database_access(
 ) -> List[DatabaseAccess]:
     """Detect database access patterns in code.
 
+    Results are cached by content; unchanged files return copies of the
+    cached accesses without re-running the patterns.
+
     Args:
         file_path: Path to the file being analyzed
         language: Programming language
@@ -112,66 +154,57 @@ def detect_database_access(
     Returns:
         List of detected database accesses
     """
-    import re
     results = []
+    line_index = LineIndex(code_content)
 
     # Check raw SQL patterns
-    for pattern in DatabaseAccessPatterns.RAW_SQL_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
+    raw_sql_set = _RAW_SQL_SETS.get(language)
+    if raw_sql_set is not None:
+        for _, match in raw_sql_set.finditer(code_content):
+            line_num = line_index.line_number(match.start())
 
             # Determine operation type
-            op_type = DatabaseOperationType.RAW_SQL
-            query = match.group(0).lower()
-            if 'select' in query:
-                op_type = DatabaseOperationType.SELECT
-            elif 'insert' in query:
-                op_type = DatabaseOperationType.INSERT
-            elif 'update' in query:
-                op_type = DatabaseOperationType.UPDATE
-            elif 'delete' in query:
-                op_type = DatabaseOperationType.DELETE
+            text = match.group(0)
+            query = text.lower()
+            op_type = next(
+                (op for keyword, op in _RAW_SQL_OPERATIONS if keyword in query),
+                DatabaseOperationType.RAW_SQL,
+            )
 
             results.append(DatabaseAccess(
                 file_path=file_path,
                 line_number=line_num,
                 operation_type=op_type,
-                query_text=match.group(0)[:100],
+                query_text=text[:100],
                 is_orm=False,
             ))
 
     # Check ORM patterns
-    for orm_framework, patterns in DatabaseAccessPatterns.ORM_PATTERNS.items():
-        for pattern in patterns:
-            matches = re.finditer(pattern, code_content, re.IGNORECASE)
-            for match in matches:
-                line_num = code_content[:match.start()].count('\n') + 1
-
-                # Determine operation type from context
-                op_type = DatabaseOperationType.ORM_QUERY
-                query = match.group(0).lower()
-                if 'create' in query:
-                    op_type = DatabaseOperationType.INSERT
-                elif 'update' in query:
-                    op_type = DatabaseOperationType.UPDATE
-                elif 'delete' in query:
-                    op_type = DatabaseOperationType.DELETE
-
-                results.append(DatabaseAccess(
-                    file_path=file_path,
-                    line_number=line_num,
-                    operation_type=op_type,
-                    is_orm=True,
-                    orm_framework=orm_framework,
-                    context=match.group(0),
-                ))
+    for index, match in _ORM_SET.finditer(code_content):
+        line_num = line_index.line_number(match.start())
+
+        # Determine operation type from context
+        text = match.group(0)
+        query = text.lower()
+        op_type = next(
+            (op for keyword, op in _ORM_OPERATIONS if keyword in query),
+            DatabaseOperationType.ORM_QUERY,
+        )
+
+        results.append(DatabaseAccess(
+            file_path=file_path,
+            line_number=line_num,
+            operation_type=op_type,
+            is_orm=True,
+            orm_framework=_ORM_FRAMEWORKS[index],
+            context=text,
+        ))
 
     # Check transaction patterns
-    for pattern in DatabaseAccessPatterns.TRANSACTION_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
+    transaction_set = _TRANSACTION_SETS.get(language)
+    if transaction_set is not None:
+        for _, match in transaction_set.finditer(code_content):
+            line_num = line_index.line_number(match.start())
             results.append(DatabaseAccess(
                 file_path=file_path,
                 line_number=line_num,
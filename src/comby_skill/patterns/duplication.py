@@ -8,18 +8,51 @@ Detects and classifies code duplication including:
 - Repeated logic
 """
 
+import hashlib
+import math
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, repeat
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Set
-from collections import defaultdict
+from typing import List, Optional, Dict, Any, Set, Iterator, Sequence, Tuple
+from collections import Counter, defaultdict
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
-@dataclass
+from comby_skill._parallel import available_cpus
+
+
+# Rabin-Karp window hashing over normalized lines, modulo a Mersenne prime
+_HASH_MODULUS = (1 << 61) - 1
+_HASH_BASE = 0x5DEECE66D
+
+# Normalization passes, applied in this order over the whole buffer. They
+# never match a newline, so line structure is preserved.
+_COMMENT = re.compile(r'(?://|#)[^\n]*')
+_DOUBLE_QUOTED = re.compile(r'"[^"\n]*"')
+_SINGLE_QUOTED = re.compile(r"'[^'\n]*'")
+# Single spaces and bare newlines are already normalized, so these skip them
+_SPACE_RUN = re.compile(r'[^\S\n]{2,}|[^\S\n ]')
+_LINE_EDGE_SPACE = re.compile(r' \n ?|\n ')
+
+# Below this much source, starting worker processes costs more than it saves
+_PARALLEL_MIN_CHARS = 1 << 22
+# Small files are sent to workers in batches of about this much source
+_BATCH_CHARS = 1 << 18
+
+
+@dataclass(slots=True)
 class DuplicateBlock:
     """Represents a duplicated code block."""
     file_path: str
     line_start: int
     line_end: int
-    hash_value: str
+    hash_value: int
     content: str
     clone_group: int  # Groups similar duplicates
 
@@ -42,97 +75,131 @@ def normalize_code(code: str) -> str:
     Returns:
         Normalized code
     """
-    import re
+    return '\n'.join(filter(None, _normalize_lines(code)))
+
 
-    # Remove comments
-    lines = code.split('\n')
-    normalized = []
+def _normalize_lines(code: str) -> List[str]:
+    """Normalize every line of code, keeping blank results in place.
 
-    for line in lines:
-        # Remove single-line comments
-        line = re.sub(r'//.*$', '', line)
-        line = re.sub(r'#.*$', '', line)
+    Args:
+        code: Source code
 
-        # Remove strings (replace with placeholder)
-        line = re.sub(r'"[^"]*"', '"__STR__"', line)
-        line = re.sub(r"'[^']*'", "'__STR__'", line)
+    Returns:
+        Normalized lines, one per line of code
+    """
+    return _normalize_buffer(code).split('\n')
 
-        # Normalize whitespace
-        line = re.sub(r'\s+', ' ', line.strip())
 
-        if line:
-            normalized.append(line)
+def _normalize_buffer(code: str) -> str:
+    """Normalize code without dropping blank lines, as one string."""
+    # Each pass runs only if its trigger characters occur at all; the
+    # substring checks are C-level scans far cheaper than a regex pass
 
-    return '\n'.join(normalized)
+    # Remove single-line comments
+    if '#' in code or '//' in code:
+        code = _COMMENT.sub('', code)
 
+    # Remove strings (replace with placeholder)
+    if '"' in code:
+        code = _DOUBLE_QUOTED.sub('"__STR__"', code)
+    if "'" in code:
+        code = _SINGLE_QUOTED.sub("'__STR__'", code)
 
-def calculate_hash(content: str, min_lines: int = 5) -> Optional[str]:
+    # Normalize whitespace
+    code = _SPACE_RUN.sub(' ', code)
+    code = _LINE_EDGE_SPACE.sub('\n', code)
+
+    return code.strip(' ')
+
+
+def _encode(text: str) -> bytes:
+    """UTF-8 encode text for hashing; lone surrogates are kept, not rejected."""
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _line_hash(data: bytes) -> int:
+    """Hash one UTF-8 encoded normalized line into the rolling hash field."""
+    if xxhash is not None:
+        value = xxhash.xxh3_64_intdigest(data)
+    else:
+        value = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+    return value % _HASH_MODULUS
+
+
+def _sequence_hash(normalized: str) -> int:
+    """Hash normalized code the same way extract_code_blocks hashes windows."""
+    h = 0
+    if normalized:
+        for line in _encode(normalized).split(b'\n'):
+            h = (h * _HASH_BASE + _line_hash(line)) % _HASH_MODULUS
+    return h
+
+
+def calculate_hash(content: str, min_lines: int = 5) -> Optional[int]:
     """Calculate hash for code block.
 
+    The hash is the one find_exact_duplicates groups blocks by. It is a
+    content fingerprint, not a cryptographic digest.
+
     Args:
         content: Code content
         min_lines: Minimum lines to consider
 
     Returns:
-        Hash string or None
+        64-bit hash or None
     """
-    import hashlib
-
     lines = content.strip().split('\n')
 
     if len(lines) < min_lines:
         return None
 
-    normalized = normalize_code(content)
-    return hashlib.md5(normalized.encode()).hexdigest()
+    return _sequence_hash(normalize_code(content))
 
 
 def find_exact_duplicates(
-    code_blocks: List[tuple],  # [(content, file_path, line_start, line_end)]
+    code_blocks: List[tuple],  # [(content, file_path, line_start, line_end[, hash, normalized])]
     min_lines: int = 5,
 ) -> List[DuplicateBlock]:
     """Find exact duplicate code blocks.
 
+    Blocks from extract_code_blocks carry their window hash; blocks without
+    one are normalized and hashed here.
+
     Args:
-        code_blocks: List of (content, file_path, line_start, line_end)
+        code_blocks: List of (content, file_path, line_start, line_end[, hash, normalized])
         min_lines: Minimum lines for detection
 
     Returns:
         List of duplicate blocks
     """
-    import hashlib
-
-    hash_map = defaultdict(list)
+    hash_map: Dict[int, List[tuple]] = {}
     duplicates = []
 
-    for content, file_path, line_start, line_end in code_blocks:
+    for content, file_path, line_start, line_end, *extracted in code_blocks:
         # Skip short blocks
-        lines = content.strip().split('\n')
-        if len(lines) < min_lines:
+        if content.strip().count('\n') + 1 < min_lines:
             continue
 
         # Calculate hash
-        normalized = normalize_code(content)
-        h = hashlib.md5(normalized.encode()).hexdigest()
-
-        hash_map[h].append({
-            'content': content,
-            'file_path': file_path,
-            'line_start': line_start,
-            'line_end': line_end,
-        })
+        if extracted:
+            h = extracted[0]
+        else:
+            h = _sequence_hash(normalize_code(content))
+
+        # Only the first 100 characters are ever reported
+        hash_map.setdefault(h, []).append((file_path, line_start, line_end, content[:100]))
 
     # Build duplicates
     group_id = 0
     for h, blocks in hash_map.items():
         if len(blocks) > 1:
-            for block in blocks:
+            for file_path, line_start, line_end, snippet in blocks:
                 duplicates.append(DuplicateBlock(
-                    file_path=block['file_path'],
-                    line_start=block['line_start'],
-                    line_end=block['line_end'],
+                    file_path=file_path,
+                    line_start=line_start,
+                    line_end=line_end,
                     hash_value=h,
-                    content=block['content'][:100],
+                    content=snippet,
                     clone_group=group_id,
                 ))
             group_id += 1
@@ -155,29 +222,87 @@ def extract_code_blocks(
         block_size: Lines per block
 
     Returns:
-        List of (content, file_path, line_start, line_end)
+        List of (content, file_path, line_start, line_end, hash, normalized)
     """
-    blocks = []
-
     lines = code_content.split('\n')
-    total_lines = len(lines)
+    normalized_lines, windows = _hashed_windows(code_content, block_size)
+
+    return [
+        (
+            '\n'.join(lines[start:start + block_size]),
+            file_path,
+            start + 1,  # 1-indexed
+            start + block_size,
+            window_hash,
+            '\n'.join(filter(None, normalized_lines[start:start + block_size])),
+        )
+        for start, window_hash in windows
+    ]
+
+
+def _hashed_windows(
+    code_content: str,
+    block_size: int,
+) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Hash every window of ``block_size`` lines worth reporting as a block.
+
+    Every line is normalized and hashed once; the hash of each window is
+    then updated in O(1) as the window slides.
+
+    Args:
+        code_content: Source code
+        block_size: Lines per block
 
-    for i in range(total_lines - block_size + 1):
-        block = '\n'.join(lines[i:i + block_size])
+    Returns:
+        (normalized lines, [(0-indexed first line, window hash), ...])
+    """
+    windows = []
+
+    normalized = _normalize_buffer(code_content)
+    normalized_lines = normalized.split('\n')
+
+    # Encode the whole buffer once and hash each distinct line once; blank
+    # lines have length 0 and never enter a window
+    encoded_lines = _encode(normalized).split(b'\n')
+    distinct_hashes = {line: _line_hash(line) for line in set(encoded_lines) if line}
+    distinct_hashes[b''] = 0
+    line_hashes = list(map(distinct_hashes.__getitem__, encoded_lines))
+    line_lengths = list(map(len, normalized_lines))
+
+    # _HASH_BASE ** (count - 1) for a window of count non-blank lines
+    powers = [pow(_HASH_BASE, k, _HASH_MODULUS) for k in range(block_size + 1)]
+    base = _HASH_BASE
+    modulus = _HASH_MODULUS
+    min_length = block_size * 2
+
+    # Hash, non-blank line count and their total length for the window
+    window_hash = 0
+    count = 0
+    length = 0
+
+    for i, line_length in enumerate(line_lengths):
+        if line_length:
+            window_hash = (window_hash * base + line_hashes[i]) % modulus
+            count += 1
+            length += line_length
+
+        start = i - block_size + 1
+        if start > 0:
+            leaving_length = line_lengths[start - 1]
+            if leaving_length:
+                window_hash = (window_hash - line_hashes[start - 1] * powers[count - 1]) % modulus
+                count -= 1
+                length -= leaving_length
+        elif start < 0:
+            continue
 
         # Skip blocks that are mostly comments or strings
-        normalized = normalize_code(block)
-        if len(normalized) < block_size * 2:
+        if (length + count - 1 if count else 0) < min_length:
             continue
 
-        blocks.append((
-            block,
-            file_path,
-            i + 1,  # 1-indexed
-            i + block_size,
-        ))
+        windows.append((start, window_hash))
 
-    return blocks
+    return normalized_lines, windows
 
 
 def find_similar_blocks(
@@ -186,8 +311,11 @@ def find_similar_blocks(
 ) -> List[tuple]:
     """Find similar (not identical) code blocks.
 
+    Only pairs that pass an exact prefix filter are scored, so the result
+    is the same as scoring every pair.
+
     Args:
-        code_blocks: List of (content, file_path, line_start, line_end)
+        code_blocks: List of (content, file_path, line_start, line_end[, hash, normalized])
         similarity_threshold: Minimum similarity to consider
 
     Returns:
@@ -195,12 +323,29 @@ def find_similar_blocks(
     """
     similar = []
 
-    for i, (content1, path1, start1, end1) in enumerate(code_blocks):
-        for j, (content2, path2, start2, end2) in enumerate(code_blocks[i+1:], i+1):
-            # Calculate similarity
-            similarity = calculate_similarity(content1, content2)
+    # Tokenize every block once, reusing the normalized text from extraction
+    token_sets = _rarity_ids([
+        frozenset(block[5].split()) if len(block) > 5 else _token_set(block[0])
+        for block in code_blocks
+    ])
+    token_counts = [len(tokens) for tokens in token_sets]
+
+    for i, candidates in _candidate_rows(token_sets, token_counts, similarity_threshold):
+        tokens1 = token_sets[i]
+        count1 = token_counts[i]
+        _, path1, start1, end1, *_ = code_blocks[i]
+
+        for j in candidates:
+            # Calculate similarity (_jaccard, inlined for the hot loop)
+            count2 = token_counts[j]
+            if count1 and count2:
+                intersection = len(tokens1 & token_sets[j])
+                similarity = intersection / (count1 + count2 - intersection)
+            else:
+                similarity = 0.0
 
             if similarity >= similarity_threshold:
+                _, path2, start2, end2, *_ = code_blocks[j]
                 similar.append((
                     (path1, start1, end1, similarity),
                     (path2, start2, end2, similarity),
@@ -209,6 +354,71 @@ def find_similar_blocks(
     return similar
 
 
+def _rarity_ids(token_sets: List[frozenset]) -> List[frozenset]:
+    """Replace tokens by integer ids numbering them from rarest to commonest.
+
+    Args:
+        token_sets: Token set per block
+
+    Returns:
+        Token id set per block
+    """
+    # Counting, ranking and numbering all stay inside C-level iteration;
+    # ties keep first-seen order, since any order gives the same pairs
+    frequency = Counter(chain.from_iterable(token_sets))
+    ids = dict(zip(sorted(frequency, key=frequency.__getitem__), range(len(frequency))))
+    return [frozenset(map(ids.__getitem__, tokens)) for tokens in token_sets]
+
+
+def _candidate_rows(
+    token_sets: List[frozenset],
+    token_counts: List[int],
+    threshold: float,
+) -> Iterator[Tuple[int, Sequence[int]]]:
+    """Yield, per block i, the blocks j > i that can reach a Jaccard threshold.
+
+    Token ids number tokens rarest first (see _rarity_ids), so sorting a
+    set orders its tokens from rarest to commonest. A pair with similarity
+    ``t`` shares at least ``ceil(t * n)`` of the ``n`` tokens of either
+    set, so it must share a token within the first ``n - ceil(t * n) + 1``
+    tokens of both (AllPairs prefix filtering). Only blocks sharing such a
+    prefix token are paired; no qualifying pair is ever dropped.
+
+    Args:
+        token_sets: Token id set per block
+        token_counts: Size of each token set
+        threshold: Minimum similarity of interest
+
+    Yields:
+        (i, sorted candidate indices j) for every block i
+    """
+    count = len(token_sets)
+
+    if not threshold > 0:
+        # Even blocks without tokens (similarity 0.0) qualify
+        for i in range(count):
+            yield i, range(i + 1, count)
+        return
+
+    prefixes = []
+    for tokens, size in zip(token_sets, token_counts):
+        # The small slack keeps float rounding from shortening the prefix
+        length = size - math.ceil(threshold * size - 1e-9) + 1
+        prefixes.append(sorted(tokens)[:max(length, 0)])
+
+    postings = defaultdict(list)
+    for i, prefix in enumerate(prefixes):
+        for token in prefix:
+            postings[token].append(i)
+
+    for i, prefix in enumerate(prefixes):
+        candidates = set()
+        for token in prefix:
+            blocks = postings[token]
+            candidates.update(blocks[bisect_right(blocks, i):])
+        yield i, sorted(candidates)
+
+
 def calculate_similarity(code1: str, code2: str) -> float:
     """Calculate similarity between two code blocks.
 
@@ -220,22 +430,31 @@ def calculate_similarity(code1: str, code2: str) -> float:
         Similarity score (0-1)
     """
     # Simple token-based similarity
-    tokens1 = set(normalize_code(code1).split())
-    tokens2 = set(normalize_code(code2).split())
+    tokens1 = _token_set(code1)
+    tokens2 = _token_set(code2)
+
+    return _jaccard(tokens1, len(tokens1), tokens2, len(tokens2))
+
+
+def _token_set(code: str) -> frozenset:
+    """Return the set of normalized tokens of a code block."""
+    return frozenset(normalize_code(code).split())
+
 
-    if not tokens1 or not tokens2:
+def _jaccard(tokens1: frozenset, count1: int, tokens2: frozenset, count2: int) -> float:
+    """Jaccard similarity of two token sets, without building their union."""
+    if not count1 or not count2:
         return 0.0
 
     intersection = len(tokens1 & tokens2)
-    union = len(tokens1 | tokens2)
-
-    return intersection / union if union > 0 else 0.0
+    return intersection / (count1 + count2 - intersection)
 
 
 def analyze_duplication(
     files: Dict[str, tuple],  # {file_path: (language, content)}
     min_block_size: int = 5,
     similarity_threshold: float = 0.8,
+    max_workers: Optional[int] = None,
 ) -> DuplicationReport:
     """Analyze code duplication across files.
 
@@ -243,27 +462,25 @@ def analyze_duplication(
         files: Dictionary of file_path -> (language, content)
         min_block_size: Minimum lines per block
         similarity_threshold: Threshold for similar detection
+        max_workers: Processes for block extraction (default: available CPUs, 1 disables)
 
     Returns:
         Duplication report
     """
     # Extract all code blocks
-    all_blocks = []
-    for file_path, (language, content) in files.items():
-        blocks = extract_code_blocks(file_path, language, content, min_block_size)
-        all_blocks.extend(blocks)
+    all_blocks = _extract_all_blocks(files, min_block_size, max_workers)
 
     # Find exact duplicates
     duplicates = find_exact_duplicates(all_blocks, min_block_size)
 
-    # Calculate metrics
-    unique_hashes = set(d.hash_value for d in duplicates)
-    total_duplicate_lines = sum(d.line_end - d.line_start for d in duplicates)
-
-    # Group duplicates
-    clone_groups = defaultdict(list)
+    # Calculate metrics and group duplicates in one pass
+    unique_hashes = set()
+    total_duplicate_lines = 0
+    clone_groups = {}
     for dup in duplicates:
-        clone_groups[dup.clone_group].append({
+        unique_hashes.add(dup.hash_value)
+        total_duplicate_lines += dup.line_end - dup.line_start
+        clone_groups.setdefault(dup.clone_group, []).append({
             'file': dup.file_path,
             'lines': f"{dup.line_start}-{dup.line_end}",
         })
@@ -279,6 +496,80 @@ def analyze_duplication(
     )
 
 
+def _extract_all_blocks(
+    files: Dict[str, tuple],
+    block_size: int,
+    max_workers: Optional[int] = None,
+) -> List[tuple]:
+    """Extract the code blocks of every file, in file order.
+
+    Large inputs are split into batches of files hashed in worker
+    processes; small ones are hashed in-process. Workers receive only
+    file contents and send back (first line, hash) integer pairs, so
+    neither paths nor block text cross the process boundary; the blocks
+    are rebuilt here around the caller's own ``file_path`` objects.
+
+    Args:
+        files: Dictionary of file_path -> (language, content)
+        block_size: Lines per block
+        max_workers: Worker process limit (default: available CPUs)
+
+    Returns:
+        (content, file_path, line_start, line_end, hash) blocks of all files
+    """
+    workers = max_workers or available_cpus()
+    total_chars = sum(len(content) for _, content in files.values())
+
+    windows_per_file = None
+    if workers > 1 and len(files) > 1 and total_chars >= _PARALLEL_MIN_CHARS:
+        batches = []
+        batch = []
+        batch_chars = 0
+        for _, content in files.values():
+            batch.append(content)
+            batch_chars += len(content)
+            if batch_chars >= _BATCH_CHARS:
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+        if batch:
+            batches.append(batch)
+
+        try:
+            windows_per_file = []
+            with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+                for batch_windows in executor.map(_hash_batch, batches, repeat(block_size)):
+                    windows_per_file.extend(batch_windows)
+        except (OSError, BrokenProcessPool):
+            # No usable process pool here; fall back to hashing in-process
+            windows_per_file = None
+
+    if windows_per_file is None:
+        windows_per_file = _hash_batch([content for _, content in files.values()], block_size)
+
+    all_blocks = []
+    for (file_path, (_, content)), windows in zip(files.items(), windows_per_file):
+        if not windows:
+            continue
+        lines = content.split('\n')
+        all_blocks.extend(
+            (
+                '\n'.join(lines[start:start + block_size]),
+                file_path,
+                start + 1,  # 1-indexed
+                start + block_size,
+                window_hash,
+            )
+            for start, window_hash in windows
+        )
+    return all_blocks
+
+
+def _hash_batch(contents: List[str], block_size: int) -> List[List[Tuple[int, int]]]:
+    """Worker process entry point: (first line, hash) windows of each file."""
+    return [_hashed_windows(content, block_size)[1] for content in contents]
+
+
 def suggest_refactoring(duplicates: List[DuplicateBlock]) -> List[str]:
     """Suggest refactoring for duplicated code.
 
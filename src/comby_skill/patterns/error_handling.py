@@ -8,10 +8,13 @@ Analyzes error handling patterns including:
 - Fallback patterns
 """
 
+import re
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+from comby_skill._regex import LineIndex, PatternSet, compile_pattern
+
 
 class ErrorHandlingPattern(Enum):
     """Types of error handling patterns."""
@@ -25,7 +28,7 @@ class ErrorHandlingPattern(Enum):
     ERROR_DECORATOR = "error_decorator"
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorHandler:
     """Represents an error handling block."""
     file_path: str
@@ -117,6 +120,57 @@ class ErrorHandlingPatterns:
     }
 
 
+# Pattern tables in detection order; fallback patterns span lines
+_HANDLER_FAMILIES = (
+    ("TRY_CATCH_PATTERNS", ErrorHandlingPattern.TRY_CATCH, False),
+    ("BARE_EXCEPT_PATTERNS", ErrorHandlingPattern.BARE_EXCEPT, False),
+    ("LOGGING_PATTERNS", ErrorHandlingPattern.ERROR_LOGGING, False),
+    ("RETRY_PATTERNS", ErrorHandlingPattern.RETRY, False),
+    ("FALLBACK_PATTERNS", ErrorHandlingPattern.FALLBACK, True),
+)
+
+
+def _build_handler_sets() -> Dict[str, tuple]:
+    """Build one PatternSet per language over every handler family.
+
+    Returns:
+        Dictionary of language -> (PatternSet, ErrorHandlingPattern per pattern)
+    """
+    languages = {
+        language
+        for family, _, _ in _HANDLER_FAMILIES
+        for language in getattr(ErrorHandlingPatterns, family)
+    }
+
+    handler_sets = {}
+    for language in sorted(languages):
+        patterns = []
+        kinds = []
+        for family, kind, dotall in _HANDLER_FAMILIES:
+            family_patterns = getattr(ErrorHandlingPatterns, family).get(language, [])
+            patterns.extend(f"(?s:{p})" if dotall else p for p in family_patterns)
+            kinds.extend([kind] * len(family_patterns))
+        handler_sets[language] = (PatternSet(patterns, re.IGNORECASE), kinds)
+
+    return handler_sets
+
+
+_HANDLER_SETS = _build_handler_sets()
+
+
+def _alternations(patterns: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Compile each language's patterns into one case-insensitive alternation."""
+    return {
+        language: compile_pattern('|'.join(f'(?:{p})' for p in pattern_list), re.IGNORECASE)
+        for language, pattern_list in patterns.items()
+        if pattern_list
+    }
+
+
+_LOGGING_RE = _alternations(ErrorHandlingPatterns.LOGGING_PATTERNS)
+_RETRY_RE = _alternations(ErrorHandlingPatterns.RETRY_PATTERNS)
+
+
 def detect_error_handling(
     file_path: str,
     language: str,
@@ -132,47 +186,44 @@ def detect_error_handling(
     Returns:
         List of detected error handlers
     """
-    import re
-
     results = []
 
-    # Find try blocks
-    for pattern in ErrorHandlingPatterns.TRY_CATCH_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
+    if language not in _HANDLER_SETS:
+        return results
+
+    pattern_set, kinds = _HANDLER_SETS[language]
+    line_index = LineIndex(code_content)
+    logging_re = _LOGGING_RE.get(language)
+    retry_re = _RETRY_RE.get(language)
+    # Split on the first try/catch match and shared by the context checks
+    lines = None
+
+    for index, match in pattern_set.finditer(code_content):
+        kind = kinds[index]
+        line_num = line_index.line_number(match.start())
 
+        if kind is ErrorHandlingPattern.TRY_CATCH:
             # Extract error type if present
             error_type = None
             if match.groups():
                 error_type = match.group(1)
 
-            # Check for logging
-            has_logging = check_for_logging(code_content, line_num, language)
-
-            # Check for retry
-            has_retry = check_for_retry(code_content, line_num, language)
-
-            # Check if swallowed
-            is_swallowed = check_if_swallowed(code_content, line_num, language)
+            if lines is None:
+                lines = code_content.split('\n')
 
             results.append(ErrorHandler(
                 file_path=file_path,
                 line_number=line_num,
                 pattern=ErrorHandlingPattern.TRY_CATCH,
                 error_type=error_type,
-                has_logging=has_logging,
-                has_retry=has_retry,
-                is_swallowed=is_swallowed,
+                has_logging=_matches_near(lines, line_num, logging_re),
+                has_retry=_matches_near(lines, line_num, retry_re),
+                is_swallowed=_is_swallowed(lines, line_num),
                 context=match.group(0),
             ))
 
-    # Find bare excepts (bad practice)
-    for pattern in ErrorHandlingPatterns.BARE_EXCEPT_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
+        elif kind is ErrorHandlingPattern.BARE_EXCEPT:
+            # Bad practice
             results.append(ErrorHandler(
                 file_path=file_path,
                 line_number=line_num,
@@ -181,12 +232,7 @@ def detect_error_handling(
                 context=match.group(0),
             ))
 
-    # Find error logging
-    for pattern in ErrorHandlingPatterns.LOGGING_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
+        elif kind is ErrorHandlingPattern.ERROR_LOGGING:
             results.append(ErrorHandler(
                 file_path=file_path,
                 line_number=line_num,
@@ -195,12 +241,7 @@ def detect_error_handling(
                 context=match.group(0),
             ))
 
-    # Find retry patterns
-    for pattern in ErrorHandlingPatterns.RETRY_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
+        elif kind is ErrorHandlingPattern.RETRY:
             results.append(ErrorHandler(
                 file_path=file_path,
                 line_number=line_num,
@@ -209,12 +250,7 @@ def detect_error_handling(
                 context=match.group(0),
             ))
 
-    # Find fallback patterns
-    for pattern in ErrorHandlingPatterns.FALLBACK_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
+        else:
             results.append(ErrorHandler(
                 file_path=file_path,
                 line_number=line_num,
@@ -240,14 +276,7 @@ def check_for_logging(
     Returns:
         True if logging is present
     """
-    import re
-
-    lines = code_content.split('\n')
-    context = '\n'.join(lines[max(0, line_num-1):min(len(lines), line_num+10)])
-
-    patterns = ErrorHandlingPatterns.LOGGING_PATTERNS.get(language, [])
-
-    return any(re.search(p, context, re.IGNORECASE) for p in patterns)
+    return _matches_near(code_content.split('\n'), line_num, _LOGGING_RE.get(language))
 
 
 def check_for_retry(
@@ -265,14 +294,7 @@ def check_for_retry(
     Returns:
         True if retry is present
     """
-    import re
-
-    lines = code_content.split('\n')
-    context = '\n'.join(lines[max(0, line_num-1):min(len(lines), line_num+10)])
-
-    patterns = ErrorHandlingPatterns.RETRY_PATTERNS.get(language, [])
-
-    return any(re.search(p, context, re.IGNORECASE) for p in patterns)
+    return _matches_near(code_content.split('\n'), line_num, _RETRY_RE.get(language))
 
 
 def check_if_swallowed(
@@ -290,7 +312,29 @@ def check_if_swallowed(
     Returns:
         True if exception is swallowed
     """
-    lines = code_content.split('\n')
+    return _is_swallowed(code_content.split('\n'), line_num)
+
+
+def _matches_near(lines: List[str], line_num: int, compiled) -> bool:
+    """Check whether a pattern occurs on the handler line or the ten after it.
+
+    Args:
+        lines: Source lines
+        line_num: 1-indexed line number of the error handler
+        compiled: Compiled pattern, or None if the language has none
+
+    Returns:
+        True if the pattern matches
+    """
+    if compiled is None:
+        return False
+
+    context = '\n'.join(lines[max(0, line_num-1):min(len(lines), line_num+10)])
+    return compiled.search(context) is not None
+
+
+def _is_swallowed(lines: List[str], line_num: int) -> bool:
+    """check_if_swallowed over already split source lines."""
     context_lines = lines[max(0, line_num-1):min(len(lines), line_num+5)]
     context = '\n'.join(context_lines)
 
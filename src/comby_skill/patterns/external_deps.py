@@ -8,10 +8,13 @@ Detects and classifies external service calls including:
 - External service patterns
 """
 
+import re
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+from comby_skill._regex import LineIndex, LiteralPrefilter, PatternSet, compile_pattern
+
 
 class ExternalServiceType(Enum):
     """Types of external service integrations."""
@@ -27,7 +30,7 @@ class ExternalServiceType(Enum):
     GENERIC_API = "generic_api"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExternalDependency:
     """Represents an external service dependency."""
     file_path: str
@@ -166,6 +169,53 @@ class ExternalDependencyPatterns:
     ]
 
 
+def _alternation(patterns: List[str], flags: int = 0):
+    """Compile patterns into one regex that matches wherever any of them does."""
+    return compile_pattern('|'.join(f'(?:{p})' for p in patterns), flags)
+
+
+_HTTP_CLIENT_SETS = {
+    language: PatternSet(patterns, re.IGNORECASE)
+    for language, patterns in ExternalDependencyPatterns.HTTP_CLIENT_PATTERNS.items()
+}
+_CALL_TYPE = compile_pattern(r'\.(get|post|put|delete|patch|request)\(', re.IGNORECASE)
+_QUOTED_TEXT = compile_pattern(r'["\']([^"\']+)["\']')
+_URL_PATH = compile_pattern(r'https?://[^/]+(/.*)')
+
+# Context checks are case-sensitive, like the original per-call joins
+_RETRY_RE = _alternation(ExternalDependencyPatterns.RETRY_PATTERNS)
+_ERROR_HANDLING_RE = _alternation(ExternalDependencyPatterns.ERROR_HANDLING_PATTERNS)
+
+# (service type, name, patterns) per service category, in report order
+_SERVICE_FAMILIES = (
+    (ExternalServiceType.AWS_SERVICE, "AWS", ExternalDependencyPatterns.AWS_PATTERNS),
+    (ExternalServiceType.CLOUD_STORAGE, "Cloud Storage", ExternalDependencyPatterns.CLOUD_STORAGE_PATTERNS),
+    (ExternalServiceType.PAYMENT_GATEWAY, "Payment", ExternalDependencyPatterns.PAYMENT_PATTERNS),
+    (ExternalServiceType.EMAIL_SERVICE, "Email", ExternalDependencyPatterns.EMAIL_PATTERNS),
+    (ExternalServiceType.ANALYTICS, "Analytics", ExternalDependencyPatterns.ANALYTICS_PATTERNS),
+    (ExternalServiceType.SOCIAL_API, "Social", ExternalDependencyPatterns.SOCIAL_PATTERNS),
+    (ExternalServiceType.MAPS_API, "Maps", ExternalDependencyPatterns.MAPS_PATTERNS),
+    (ExternalServiceType.AI_SERVICE, "AI", ExternalDependencyPatterns.AI_PATTERNS),
+)
+
+# (service type, name, one alternation over the category), in report order
+_SERVICE_CATEGORIES = tuple(
+    (service_type, name, _alternation(patterns, re.IGNORECASE))
+    for service_type, name, patterns in _SERVICE_FAMILIES
+)
+
+# Literal prefilter over every service pattern, and the category of each
+_SERVICE_PREFILTER = LiteralPrefilter(
+    [pattern for _, _, patterns in _SERVICE_FAMILIES for pattern in patterns],
+    re.IGNORECASE,
+)
+_SERVICE_PATTERN_CATEGORY = [
+    position
+    for position, (_, _, patterns) in enumerate(_SERVICE_FAMILIES)
+    for _ in patterns
+]
+
+
 def detect_external_dependencies(
     file_path: str,
     language: str,
@@ -181,60 +231,51 @@ def detect_external_dependencies(
     Returns:
         List of detected external dependencies
     """
-    import re
     results = []
 
-    # Detect service type from imports/requires
-    service_types = detect_service_types(code_content)
+    http_client_set = _HTTP_CLIENT_SETS.get(language)
+    if http_client_set is None:
+        return results
+
+    # Detect service type from imports/requires; the first one found is used
+    service_type, service_name = next(
+        iter(detect_service_types(code_content).items()),
+        (ExternalServiceType.HTTP_CLIENT, "HTTP"),
+    )
+
+    line_index = LineIndex(code_content)
 
     # Find HTTP client calls
-    for pattern in ExternalDependencyPatterns.HTTP_CLIENT_PATTERNS.get(language, []):
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
-            # Determine call type
-            call_type = "UNKNOWN"
-            call_match = re.search(r'\.(get|post|put|delete|patch|request)\(', match.group(0), re.IGNORECASE)
-            if call_match:
-                call_type = call_match.group(1).upper()
-
-            # Check for retry
-            has_retry = bool(re.search('|'.join(ExternalDependencyPatterns.RETRY_PATTERNS),
-                                       code_content[max(0, match.start()-200):match.start()]))
-
-            # Check for error handling
-            has_error = bool(re.search('|'.join(ExternalDependencyPatterns.ERROR_HANDLING_PATTERNS),
-                                       code_content[max(0, match.start()-100):match.start()]))
-
-            # Check for async
-            is_async = "async" in code_content[max(0, match.start()-50):match.start()]
-
-            # Extract endpoint if possible
-            endpoint = extract_endpoint(match.group(0))
-
-            # Determine service type
-            service_type = ExternalServiceType.HTTP_CLIENT
-            service_name = "HTTP"
-
-            if service_types:
-                for st, name in service_types.items():
-                    service_type = st
-                    service_name = name
-                    break
-
-            results.append(ExternalDependency(
-                file_path=file_path,
-                line_number=line_num,
-                service_type=service_type,
-                service_name=service_name,
-                call_type=call_type,
-                endpoint=endpoint,
-                has_retry=has_retry,
-                has_error_handling=has_error,
-                is_async=is_async,
-                context=match.group(0)[:100],
-            ))
+    for _, match in http_client_set.finditer(code_content):
+        start = match.start()
+        line_num = line_index.line_number(start)
+
+        # Determine call type
+        call_type = "UNKNOWN"
+        call_match = _CALL_TYPE.search(match.group(0))
+        if call_match:
+            call_type = call_match.group(1).upper()
+
+        # Check the code just before the call without slicing it out
+        has_retry = _RETRY_RE.search(code_content, max(0, start - 200), start) is not None
+        has_error = _ERROR_HANDLING_RE.search(code_content, max(0, start - 100), start) is not None
+        is_async = code_content.find("async", max(0, start - 50), start) != -1
+
+        # Extract endpoint if possible
+        endpoint = extract_endpoint(match.group(0))
+
+        results.append(ExternalDependency(
+            file_path=file_path,
+            line_number=line_num,
+            service_type=service_type,
+            service_name=service_name,
+            call_type=call_type,
+            endpoint=endpoint,
+            has_retry=has_retry,
+            has_error_handling=has_error,
+            is_async=is_async,
+            context=match.group(0)[:100],
+        ))
 
     return results
 
@@ -248,40 +289,22 @@ def detect_service_types(code_content: str) -> Dict[ExternalServiceType, str]:
     Returns:
         Dictionary of service types found
     """
-    import re
     services = {}
 
-    # AWS
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.AWS_PATTERNS):
-        services[ExternalServiceType.AWS_SERVICE] = "AWS"
-
-    # Cloud Storage
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.CLOUD_STORAGE_PATTERNS):
-        services[ExternalServiceType.CLOUD_STORAGE] = "Cloud Storage"
-
-    # Payment
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.PAYMENT_PATTERNS):
-        services[ExternalServiceType.PAYMENT_GATEWAY] = "Payment"
-
-    # Email
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.EMAIL_PATTERNS):
-        services[ExternalServiceType.EMAIL_SERVICE] = "Email"
-
-    # Analytics
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.ANALYTICS_PATTERNS):
-        services[ExternalServiceType.ANALYTICS] = "Analytics"
-
-    # Social
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.SOCIAL_PATTERNS):
-        services[ExternalServiceType.SOCIAL_API] = "Social"
-
-    # Maps
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.MAPS_PATTERNS):
-        services[ExternalServiceType.MAPS_API] = "Maps"
+    # Most files name no service at all: one scan for the literals the
+    # patterns require rules out categories before any regex runs
+    candidates = {
+        _SERVICE_PATTERN_CATEGORY[index]
+        for index in _SERVICE_PREFILTER.candidates(code_content)
+    }
+    if not candidates:
+        return services
 
-    # AI
-    if any(re.search(p, code_content, re.IGNORECASE) for p in ExternalDependencyPatterns.AI_PATTERNS):
-        services[ExternalServiceType.AI_SERVICE] = "AI"
+    # One pass per remaining category (AWS, cloud storage, payment, email,
+    # analytics, social, maps, AI) instead of one per pattern
+    for position, (service_type, name, category) in enumerate(_SERVICE_CATEGORIES):
+        if position in candidates and category.search(code_content):
+            services[service_type] = name
 
     return services
 
@@ -295,14 +318,13 @@ def extract_endpoint(call: str) -> Optional[str]:
     Returns:
         Extracted endpoint or None
     """
-    import re
     # Try to find URL in quotes
-    match = re.search(r'["\']([^"\']+)["\']', call)
+    match = _QUOTED_TEXT.search(call)
     if match:
         url = match.group(1)
         if url.startswith('http'):
             # Extract path from URL
-            path_match = re.search(r'https?://[^/]+(/.*)', url)
+            path_match = _URL_PATH.search(url)
             if path_match:
                 return path_match.group(1)
         return url[:50]
@@ -8,10 +8,15 @@ Detects and classifies HTTP endpoint definitions including:
 - API specifications
 """
 
+import re
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Union
 from enum import Enum
 
+from comby_skill._regex import LineIndex, PatternSet, compile_pattern
+
 
 class HTTPMethod(Enum):
     """HTTP methods."""
@@ -24,6 +29,16 @@ class HTTPMethod(Enum):
     HEAD = "head"
 
 
+class Framework(Enum):
+    """Web frameworks with route patterns."""
+    FLASK = "flask"
+    FASTAPI = "fastapi"
+    DJANGO = "django"
+    EXPRESS = "express"
+    KOA = "koa"
+    GO = "go"
+
+
 @dataclass
 class HTTPEndpoint:
     """Represents an HTTP endpoint definition."""
@@ -31,7 +46,7 @@ class HTTPEndpoint:
     line_number: int
     method: HTTPMethod
     path: str
-    framework: str
+    framework: Union[str, Framework]
     handler_name: Optional[str] = None
     middleware: List[str] = None
     is_async: bool = False
@@ -39,51 +54,60 @@ class HTTPEndpoint:
     def __post_init__(self):
         if self.middleware is None:
             self.middleware = []
+        # Framework names are still accepted, as before the enum
+        if isinstance(self.framework, str):
+            self.framework = Framework(self.framework)
 
 
 class HTTPEndpointPatterns:
     """Pattern definitions for HTTP endpoint detection."""
 
-    # Framework-specific patterns
+    # Framework-specific patterns; the route path is captured as "path".
+    # Repeats are bounded so a long or malformed line cannot make a
+    # pattern backtrack over the whole file.
     FRAMEWORK_PATTERNS = {
         "flask": [
-            (r"@app\.route\(['\"]([^'\"]+)['\"]", "GET"),
-            (r"@app\.route\(['\"]([^'\"]+)['\"].*method\s*=\s*\[[^\]]*'GET'", "GET"),
-            (r"@app\.route\(['\"]([^'\"]+)['\"].*method\s*=\s*\[[^\]]*'POST'", "POST"),
-            (r"@app\.route\(['\"]([^'\"]+)['\"].*method\s*=\s*\[[^\]]*'PUT'", "PUT"),
-            (r"@app\.route\(['\"]([^'\"]+)['\"].*method\s*=\s*\[[^\]]*'DELETE'", "DELETE"),
-            (r"@app\.get\(['\"]([^'\"]+)['\"]\)", "GET"),
-            (r"@app\.post\(['\"]([^'\"]+)['\"]\)", "POST"),
-            (r"@app\.put\(['\"]([^'\"]+)['\"]\)", "PUT"),
-            (r"@app\.delete\(['\"]([^'\"]+)['\"]\)", "DELETE"),
-            (r"@app\.patch\(['\"]([^'\"]+)['\"]\)", "PATCH"),
+            (r"@app\.route\(['\"](?P<path>[^'\"\n]{1,512})['\"]", "GET"),
+            (r"@app\.route\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200}method\s*=\s*\[[^\]]{0,200}'GET'", "GET"),
+            (r"@app\.route\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200}method\s*=\s*\[[^\]]{0,200}'POST'", "POST"),
+            (r"@app\.route\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200}method\s*=\s*\[[^\]]{0,200}'PUT'", "PUT"),
+            (
+                r"@app\.route\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200}"
+                r"method\s*=\s*\[[^\]]{0,200}'DELETE'",
+                "DELETE",
+            ),
+            (r"@app\.get\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "GET"),
+            (r"@app\.post\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "POST"),
+            (r"@app\.put\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "PUT"),
+            (r"@app\.delete\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "DELETE"),
+            (r"@app\.patch\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "PATCH"),
         ],
         "fastapi": [
-            (r"@(app|router)\.get\(['\"]([^'\"]+)['\"]\)", "GET"),
-            (r"@(app|router)\.post\(['\"]([^'\"]+)['\"]\)", "POST"),
-            (r"@(app|router)\.put\(['\"]([^'\"]+)['\"]\)", "PUT"),
-            (r"@(app|router)\.delete\(['\"]([^'\"]+)['\"]\)", "DELETE"),
-            (r"@(app|router)\.patch\(['\"]([^'\"]+)['\"]\)", "PATCH"),
-            (r"@(app|router)\.options\(['\"]([^'\"]+)['\"]\)", "OPTIONS"),
+            (r"@(app|router)\.get\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "GET"),
+            (r"@(app|router)\.post\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "POST"),
+            (r"@(app|router)\.put\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "PUT"),
+            (r"@(app|router)\.delete\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "DELETE"),
+            (r"@(app|router)\.patch\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "PATCH"),
+            (r"@(app|router)\.options\(['\"](?P<path>[^'\"\n]{1,512})['\"]\)", "OPTIONS"),
         ],
         "django": [
-            (r"path\(['\"]([^'\"]+)['\"].*,\s*(\w+)", "GET"),
-            (r"re_path\(['\"]([^'\"]+)['\"].*,\s*(\w+)", "GET"),
-            (r"@login_required.*def\s+(\w+)", None),
+            (r"path\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200},\s*(\w+)", "GET"),
+            (r"re_path\(['\"](?P<path>[^'\"\n]{1,512})['\"][^\n]{0,200},\s*(\w+)", "GET"),
+            (r"@login_required[^\n]{0,200}def\s+(\w+)", None),
         ],
         "express": [
-            (r"app\.(get|post|put|delete|patch|options)\s*\(\s*['\"]([^'\"]+)['\"]", None),
-            (r"router\.(get|post|put|delete|patch|options)\s*\(\s*['\"]([^'\"]+)['\"]", None),
-            (r"app\.all\s*\(\s*['\"]([^'\"]+)['\"]", None),
+            (r"app\.(get|post|put|delete|patch|options)\s*\(\s*['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
+            (r"router\.(get|post|put|delete|patch|options)\s*\(\s*['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
+            (r"app\.all\s*\(\s*['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
         ],
         "koa": [
-            (r"router\.(get|post|put|delete|patch)\s*\(\s*['\"]([^'\"]+)['\"]", None),
-            (r"app\.(get|post|put|delete|patch)\s*\(\s*['\"]([^'\"]+)['\"]", None),
+            (r"router\.(get|post|put|delete|patch)\s*\(\s*['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
+            (r"app\.(get|post|put|delete|patch)\s*\(\s*['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
         ],
         "go": [
-            (r"http\.(Handle|HandleFunc)\s*\(['\"]([^'\"]+)['\"]", None),
-            (r"router\.(GET|POST|PUT|DELETE|PATCH)\s*\(['\"]([^'\"]+)['\"]", None),
-            (r"@router\.(get|post|put|delete|patch)\s*\(['\"]([^'\"]+)['\"]", None),
+            (r"http\.(Handle|HandleFunc)\s*\(['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
+            (r"router\.(GET|POST|PUT|DELETE|PATCH)\s*\(['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
+            (r"@router\.(get|post|put|delete|patch)\s*\(['\"](?P<path>[^'\"\n]{1,512})['\"]", None),
         ],
     }
 
@@ -103,11 +127,94 @@ class HTTPEndpointPatterns:
     }
 
 
+# (value, method) in declaration order; enum iteration and .value are slow
+_METHODS_BY_VALUE = tuple((method.value, method) for method in HTTPMethod)
+
+
+def _endpoint_resolver(compiled, default_method: Optional[str]) -> Callable:
+    """Build a function giving the method and path of a route pattern's match.
+
+    Everything that depends only on the pattern (its path group, its
+    fixed method) is looked up here once instead of per match.
+
+    Args:
+        compiled: Compiled route pattern
+        default_method: Method of every match, or None to find it in the match
+
+    Returns:
+        Function mapping a match to (HTTPMethod, path)
+    """
+    if "path" in compiled.groupindex:
+        path_group = "path"
+    elif compiled.groups:
+        path_group = 1
+    else:
+        path_group = None
+
+    if default_method is not None:
+        method = HTTPMethod(default_method.lower())
+        if path_group is None:
+            return lambda match: (method, "/")
+        return lambda match: (method, match.group(path_group))
+
+    def resolve(match):
+        # The first method named anywhere in the match, GET if none is
+        full_match = match.group(0).lower()
+        for value, found in _METHODS_BY_VALUE:
+            if value in full_match:
+                break
+        else:
+            found = HTTPMethod.GET
+        return found, match.group(path_group) if path_group is not None else "/"
+
+    return resolve
+
+
+def _build_framework_sets() -> Dict[str, tuple]:
+    """Build one PatternSet per framework over its route patterns.
+
+    Returns:
+        Dictionary of framework name -> (Framework, PatternSet, resolver
+        per pattern)
+    """
+    framework_sets = {}
+    for framework, patterns in HTTPEndpointPatterns.FRAMEWORK_PATTERNS.items():
+        pattern_set = PatternSet([pattern for pattern, _ in patterns], re.IGNORECASE)
+        resolvers = [
+            _endpoint_resolver(compiled, method)
+            for compiled, (_, method) in zip(pattern_set.compiled, patterns)
+        ]
+        framework_sets[framework] = (Framework(framework), pattern_set, resolvers)
+
+    return framework_sets
+
+
+_FRAMEWORK_SETS = _build_framework_sets()
+
+# (indicator, framework), checked in order; the first one found wins
+_FRAMEWORK_INDICATORS = tuple(
+    (compile_pattern(pattern), framework)
+    for pattern, framework in (
+        (r"from\s+flask\s+import|import\s+flask", "flask"),
+        (r"from\s+fastapi\s+import|import\s+fastapi", "fastapi"),
+        (r"from\s+express\s+import|const\s+express\s*=", "express"),
+        (r"from\s+django|import\s+django", "django"),
+        (r"from\s+koa|import\s+koa", "koa"),
+        (r'"koa"|\'koa\'', "koa"),
+        (r'import\s+"net/http"|import\s+\'net/http\'', "go"),
+    )
+)
+
+_USE_CALL = compile_pattern(r'\.use\s*\(')
+_USE_NAME = compile_pattern(r'\.use\s*\(\s*([^,\s)]+)')
+_MIDDLEWARE_DECORATOR = compile_pattern(r'@app\.middleware|@router\.middleware')
+
+
 def detect_http_endpoints(
     file_path: str,
     language: str,
     code_content: str,
-    framework: Optional[str] = None,
+    framework: Optional[Union[str, Framework]] = None,
 ) -> List[HTTPEndpoint]:
     """Detect HTTP endpoint definitions in code.
 
@@ -115,58 +222,50 @@ def detect_http_endpoints(
         file_path: Path to the file being analyzed
         language: Programming language
         code_content: Source code content
-        framework: Optional framework hint
+        framework: Optional framework hint (name or Framework)
 
     Returns:
         List of detected HTTP endpoints
     """
-    import re
     results = []
 
     # Determine framework
-    if not framework:
+    if isinstance(framework, Framework):
+        framework = framework.value
+    elif not framework:
         framework = detect_framework(code_content)
 
-    if framework not in HTTPEndpointPatterns.FRAMEWORK_PATTERNS:
+    if framework not in _FRAMEWORK_SETS:
         return results
 
+    framework, pattern_set, resolvers = _FRAMEWORK_SETS[framework]
+    line_index = LineIndex(code_content)
+
+    # Only a file that says "async" somewhere needs checking per endpoint
+    has_async = "async" in code_content
+
     # Find endpoints
-    for pattern, default_method in HTTPEndpointPatterns.FRAMEWORK_PATTERNS[framework]:
-        matches = re.finditer(pattern, code_content, re.IGNORECASE)
-        for match in matches:
-            line_num = code_content[:match.start()].count('\n') + 1
-
-            # Extract path
-            path = match.group(1) if len(match.groups()) >= 1 else "/"
-
-            # Determine method
-            method_str = default_method
-            if method_str is None:
-                # Try to extract from pattern match
-                full_match = match.group(0).lower()
-                for m in HTTPMethod:
-                    if m.value in full_match:
-                        method_str = m.value
-                        break
-
-            if method_str is None:
-                method_str = "GET"
-
-            # Check for async
-            is_async = "async" in code_content[max(0, match.start()-50):match.start()]
-
-            results.append(HTTPEndpoint(
-                file_path=file_path,
-                line_number=line_num,
-                method=HTTPMethod(method_str.lower()),
-                path=path,
-                framework=framework,
-                is_async=is_async,
-            ))
-
-    # Find middleware
-    for endpoint in results:
-        endpoint.middleware = detect_middleware(code_content, endpoint.line_number)
+    for index, match in pattern_set.finditer(code_content):
+        line_num = line_index.line_number(match.start())
+        method, path = resolvers[index](match)
+
+        # Check for async
+        is_async = has_async and "async" in code_content[max(0, match.start()-50):match.start()]
+
+        results.append(HTTPEndpoint(
+            file_path=file_path,
+            line_number=line_num,
+            method=method,
+            path=path,
+            framework=framework,
+            is_async=is_async,
+        ))
+
+    # Find middleware; every endpoint gets the uses on the lines above it
+    if results:
+        middleware_lines, middleware = _middleware_uses(code_content)
+        for endpoint in results:
+            endpoint.middleware = middleware[:bisect_left(middleware_lines, endpoint.line_number - 1)]
 
     return results
 
@@ -180,23 +279,10 @@ def detect_framework(code_content: str) -> Optional[str]:
     Returns:
         Framework name or None
     """
-    import re
-
     # Check for framework indicators
-    if re.search(r"from\s+flask\s+import|import\s+flask", code_content):
-        return "flask"
-    if re.search(r"from\s+fastapi\s+import|import\s+fastapi", code_content):
-        return "fastapi"
-    if re.search(r"from\s+express\s+import|const\s+express\s*=", code_content):
-        return "express"
-    if re.search(r"from\s+django|import\s+django", code_content):
-        return "django"
-    if re.search(r"from\s+koa|import\s+koa", code_content):
-        return "koa"
-    if re.search(r'"koa"|\'koa\'', code_content):
-        return "koa"
-    if re.search(r'import\s+"net/http"|import\s+\'net/http\'', code_content):
-        return "go"
+    for indicator, framework in _FRAMEWORK_INDICATORS:
+        if indicator.search(code_content):
+            return framework
 
     return None
 
@@ -211,28 +297,37 @@ def detect_middleware(code_content: str, endpoint_line: int) -> List[str]:
     Returns:
         List of middleware names
     """
-    import re
-    middleware = []
-
-    lines = code_content.split('\n')
+    middleware_lines, middleware = _middleware_uses(code_content)
 
     # Look for middleware before the endpoint
-    for i, line in enumerate(lines):
-        if i >= endpoint_line - 1:
-            break
+    return middleware[:bisect_left(middleware_lines, endpoint_line - 1)]
+
+
+def _middleware_uses(code_content: str) -> Tuple[List[int], List[str]]:
+    """Find every middleware use in a file.
+
+    Args:
+        code_content: Source code content
 
-        # Check for middleware patterns
-        if re.search(r'\.use\s*\(', line):
-            match = re.search(r'\.use\s*\(\s*([^,\s)]+)', line)
+    Returns:
+        (0-indexed line of each use, middleware name of each use), in order
+    """
+    middleware_lines = []
+    middleware = []
+
+    for i, line in enumerate(code_content.split('\n')):
+        # Check for middleware patterns; the literal tests skip most lines
+        if '.use' in line and _USE_CALL.search(line):
+            match = _USE_NAME.search(line)
             if match:
+                middleware_lines.append(i)
                 middleware.append(match.group(1))
 
-        if re.search(r'@app\.middleware|@router\.middleware', line):
-            match = re.search(r'@app\.middleware|@router\.middleware', line)
-            if match:
-                middleware.append("app_middleware")
+        if 'middleware' in line and _MIDDLEWARE_DECORATOR.search(line):
+            middleware_lines.append(i)
+            middleware.append("app_middleware")
 
-    return middleware
+    return middleware_lines, middleware
 
 
 def classify_endpoints(endpoints: List[HTTPEndpoint]) -> Dict[str, Any]:
@@ -244,46 +339,30 @@ def classify_endpoints(endpoints: List[HTTPEndpoint]) -> Dict[str, Any]:
     Returns:
         Classification summary
     """
+    restful = [classify_as_restful(endpoint) for endpoint in endpoints]
+
+    # Count the value strings; enum members hash in Python, strings in C
     classification = {
         "total_endpoints": len(endpoints),
-        "endpoints_by_method": {},
-        "endpoints_by_framework": {},
-        "async_count": 0,
-        "with_middleware": 0,
+        "endpoints_by_method": dict(Counter(endpoint.method.value for endpoint in endpoints)),
+        "endpoints_by_framework": dict(Counter(endpoint.framework.value for endpoint in endpoints)),
+        "async_count": sum(1 for endpoint in endpoints if endpoint.is_async),
+        "with_middleware": sum(1 for endpoint in endpoints if endpoint.middleware),
         "restfulness": {
-            "compliant": 0,
-            "issues": [],
+            "compliant": sum(restful),
+            "issues": [
+                f"{endpoint.path} uses {endpoint.method.value}"
+                for endpoint, compliant in zip(endpoints, restful)
+                if not compliant
+            ],
         },
     }
 
-    for endpoint in endpoints:
-        # Count by method
-        method = endpoint.method.value
-        classification["endpoints_by_method"][method] = \
-            classification["endpoints_by_method"].get(method, 0) + 1
-
-        # Count by framework
-        fw = endpoint.framework
-        classification["endpoints_by_framework"][fw] = \
-            classification["endpoints_by_framework"].get(fw, 0) + 1
+    return classification
 
-        # Async count
-        if endpoint.is_async:
-            classification["async_count"] += 1
 
-        # Middleware count
-        if endpoint.middleware:
-            classification["with_middleware"] += 1
-
-        # REST compliance
-        if classify_as_restful(endpoint):
-            classification["restfulness"]["compliant"] += 1
-        else:
-            classification["restfulness"]["issues"].append(
-                f"{endpoint.path} uses {endpoint.method.value}"
-            )
-
-    return classification
+# Action-based (non-RESTful) path segments
+_NON_RESTFUL = compile_pattern(r"/(?:add|edit|delete|update|create)")
 
 
 def classify_as_restful(endpoint: HTTPEndpoint) -> bool:
@@ -296,14 +375,4 @@ def classify_as_restful(endpoint: HTTPEndpoint) -> bool:
         True if RESTful
     """
     # Simple heuristic for REST compliance
-    path = endpoint.path.lower()
-    method = endpoint.method.value
-
-    # Check for action-based (non-RESTful) patterns
-    non_restful = ['/add', '/edit', '/delete', '/update', '/create']
-
-    for pattern in non_restful:
-        if pattern in path:
-            return False
-
-    return True
+    return _NON_RESTFUL.search(endpoint.path.lower()) is None
@@ -1,16 +1,56 @@
 """Search engine for grep-like pattern matching across files and directories."""
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import fnmatch
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 import json
 import csv
 from io import StringIO
 
+from comby_skill._parallel import available_cpus
+from comby_skill._regex import (
+    LineIndex,
+    compile_pattern,
+    is_line_local,
+    literal_prefix,
+    required_literal,
+)
+
+
+# Files searched in-process before handing the rest to worker processes,
+# and files per worker task; below two batches a pool costs more than it saves
+_BATCH_FILES = 64
+_PARALLEL_MIN_FILES = 2 * _BATCH_FILES
+
+# Bytes that a text-mode read changes (newline translation) or that str
+# patterns treat differently from bytes patterns (\s matches \x1c-\x1f)
+_TEXT_ONLY_BYTES = (b'\r', b'\x1c', b'\x1d', b'\x1e', b'\x1f')
+
+# Files larger than this are searched a chunk at a time, when possible
+_STREAM_BYTES = 1 << 20
+
+# SearchEngine of a worker process, built by _init_worker
+_worker_engine = None
+
 
 class SearchResult:
     """Represents a single search result match."""
 
+    # One instance per match; no per-instance __dict__
+    __slots__ = (
+        'file_path',
+        'line_number',
+        'column_number',
+        'matched_text',
+        'context_before',
+        'context_after',
+    )
+
     def __init__(
         self,
         file_path: Path,
@@ -43,23 +83,59 @@ class SearchResult:
 class SearchEngine:
     """Search engine for finding patterns in files and directories."""
 
-    def __init__(self, pattern: str, case_insensitive: bool = False):
+    def __init__(self, pattern: str, case_insensitive: bool = False, use_re2: bool = False):
         """Initialize search engine with a regex pattern.
 
+        The pattern runs on the stdlib ``re`` engine. With ``use_re2``, it
+        runs on RE2 (linear-time matching, so safe for untrusted patterns)
+        when google-re2 is installed and matches the pattern exactly as
+        ``re`` does; patterns using Unicode ``\\w``, ``\\d``, ``\\s`` or ``\\b``
+        and the like stay on ``re``, so results never change.
+
         Args:
             pattern: Regex pattern to search for
             case_insensitive: Whether to perform case-insensitive search
+            use_re2: Whether to prefer RE2 when it matches alike
 
         Raises:
             ValueError: If the regex pattern is invalid
         """
         flags = re.IGNORECASE if case_insensitive else 0
+        compile = compile_pattern if use_re2 else re.compile
         try:
-            self.pattern = re.compile(pattern, flags)
+            self.pattern = compile(pattern, flags)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
+        self._source = pattern
+
+        # Patterns that never match across a newline scan whole files at once
+        self._file_pattern = None
+        if is_line_local(pattern, flags):
+            self._file_pattern = compile(pattern, flags | re.MULTILINE)
+
+        # Text every match contains: files without it can't match. Text-mode
+        # reads turn \r\n into \n, so only the part between newlines is used.
+        # A whole-file scan finds a literal prefix as fast as a substring test
+        self._must_contain = None
+        literal = None if case_insensitive else required_literal(pattern)
+        if literal and self._file_pattern is not None and literal == literal_prefix(pattern):
+            literal = None
+        if literal:
+            literal = max(literal.split('\n'), key=len)
+        if literal:
+            self._must_contain = literal.encode('utf-8', 'surrogatepass')
+
+        # An ASCII pattern first runs over the raw bytes of ASCII files, so
+        # files without a match are never decoded
+        self._bytes_pattern = None
+        if self._file_pattern is not None and pattern.isascii():
+            try:
+                self._bytes_pattern = compile(pattern.encode('ascii'), flags | re.MULTILINE)
+            except re.error:
+                pass
 
         self.case_insensitive = case_insensitive
+        self.use_re2 = use_re2
 
     def search(
         self,
@@ -69,9 +145,15 @@ class SearchEngine:
         exclude_pattern: Optional[str] = None,
         context_lines: int = 0,
         max_results: int = 100,
+        max_workers: Optional[int] = None,
     ) -> List[SearchResult]:
         """Search for pattern in files.
 
+        The first files are searched in-process; if the results limit is
+        not reached by then and enough files remain, those are searched in
+        worker processes. Results are the same, and in the same order,
+        either way.
+
         Args:
             root_path: Root directory to search (default: current directory)
             recursive: Whether to search recursively (default: True)
@@ -79,6 +161,7 @@ class SearchEngine:
             exclude_pattern: File glob pattern to exclude (default: None)
             context_lines: Number of lines to include before/after match (default: 0)
             max_results: Maximum number of results to return (default: 100)
+            max_workers: Worker process limit (default: available CPUs, 1 disables)
 
         Returns:
             List of SearchResult objects
@@ -91,25 +174,55 @@ class SearchEngine:
             raise ValueError(f"Path does not exist: {root_path}")
 
         results = []
-        results_count = 0
 
-        # Determine search pattern
-        if recursive:
-            glob_pattern = f"**/{include_pattern}"
-        else:
-            glob_pattern = include_pattern
+        files = _iter_files(root, recursive, include_pattern, exclude_pattern)
+        workers = max_workers or available_cpus()
+        if workers > 1:
+            # The rest of the tree is only walked if the first batch falls short
+            results = self._search_files(islice(files, _BATCH_FILES), context_lines, max_results)
+            if len(results) >= max_results:
+                return results
+            files = list(files)
+            if len(files) >= _PARALLEL_MIN_FILES:
+                try:
+                    results.extend(self._search_parallel(
+                        files,
+                        workers,
+                        context_lines,
+                        max_results - len(results),
+                    ))
+                    return results
+                except (OSError, BrokenProcessPool):
+                    # No usable process pool here; continue in-process
+                    pass
+
+        results.extend(self._search_files(files, context_lines, max_results - len(results)))
+        return results
 
-        # Search files
-        for file_path in root.glob(glob_pattern):
-            if results_count >= max_results:
-                break
+    def _search_files(
+        self,
+        files: Iterable[Union[str, Path]],
+        context_lines: int,
+        max_results: int,
+    ) -> List[SearchResult]:
+        """Search files in order until the results limit is reached.
 
-            if not file_path.is_file():
-                continue
+        Files that can't be read are skipped.
 
-            # Check exclude pattern
-            if exclude_pattern and file_path.match(exclude_pattern):
-                continue
+        Args:
+            files: Paths of the files to search
+            context_lines: Number of lines to include before/after match
+            max_results: Maximum number of results
+
+        Returns:
+            List of SearchResult objects
+        """
+        results = []
+        results_count = 0
+
+        for file_path in files:
+            if results_count >= max_results:
+                break
 
             # Search within file
             try:
@@ -126,9 +239,78 @@ class SearchEngine:
 
         return results
 
+    def _search_parallel(
+        self,
+        files: List[Union[str, Path]],
+        workers: int,
+        context_lines: int,
+        max_results: int,
+    ) -> List[SearchResult]:
+        """Search batches of files in worker processes.
+
+        Batches are consumed in file order; once the results limit is
+        reached, batches not yet started are cancelled.
+
+        Args:
+            files: Paths of the files to search
+            workers: Worker process limit
+            context_lines: Number of lines to include before/after match
+            max_results: Maximum number of results
+
+        Returns:
+            List of SearchResult objects
+
+        Raises:
+            OSError: If worker processes cannot be started
+            BrokenProcessPool: If a worker process dies
+        """
+        results = []
+
+        batch_results = self._map_batches(_search_batch, files, workers, context_lines, max_results)
+        try:
+            for batch in batch_results:
+                remaining = max_results - len(results)
+                if len(batch) >= remaining:
+                    results.extend(islice(batch, remaining))
+                    break
+                results.extend(batch)
+        finally:
+            batch_results.close()
+
+        return results
+
+    def _map_batches(self, function, files: List[Union[str, Path]], workers: int, *args) -> Iterator:
+        """Apply a worker function to batches of files in worker processes.
+
+        Args:
+            function: Module-level function taking a batch of files and args
+            files: Paths of the files to process
+            workers: Worker process limit
+            *args: Further arguments passed with every batch
+
+        Returns:
+            Iterator over the batch results, in file order; closing it
+            cancels batches not yet started
+
+        Raises:
+            OSError: If worker processes cannot be started
+            BrokenProcessPool: If a worker process dies
+        """
+        batches = [files[i:i + _BATCH_FILES] for i in range(0, len(files), _BATCH_FILES)]
+
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)),
+            initializer=_init_worker,
+            initargs=(self._source, self.case_insensitive, self.use_re2),
+        )
+        try:
+            yield from executor.map(function, batches, *map(repeat, args))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _search_file(
         self,
-        file_path: Path,
+        file_path: Union[str, Path],
         context_lines: int = 0,
         max_results: int = 100,
     ) -> List[SearchResult]:
@@ -142,20 +324,174 @@ class SearchEngine:
         Returns:
             List of SearchResult objects from this file
         """
+        try:
+            with open(file_path, 'rb') as f:
+                if (
+                    self._file_pattern is not None
+                    and not context_lines
+                    and os.fstat(f.fileno()).st_size > _STREAM_BYTES
+                ):
+                    results = self._search_stream(file_path, f, max_results)
+                else:
+                    content = self._decode_if_match(f.read())
+                    if content is None:
+                        results = []
+                    elif self._file_pattern is not None:
+                        results = self._search_content(file_path, content, context_lines, max_results)
+                    else:
+                        results = self._search_lines(file_path, content, context_lines, max_results)
+        except (UnicodeDecodeError, IOError):
+            return []
+
+        # Results carry a Path; build it only for files that match
+        if results and not isinstance(file_path, Path):
+            file_path = Path(file_path)
+            for result in results:
+                result.file_path = file_path
+
+        return results
+
+    def _search_stream(self, file_path: Union[str, Path], f, max_results: int) -> List[SearchResult]:
+        """Search a file with the line-local pattern a chunk of lines at a time.
+
+        Chunks end at a newline, which neither a UTF-8 sequence nor a
+        line-local match spans. Once max_results is reached the rest of the
+        file is only checked to be UTF-8, and chunks the prefilter skips are
+        checked too, so the results are those of searching the whole file at
+        once: none for a file that is not valid UTF-8.
+
+        Args:
+            file_path: Path of the file searched
+            f: The file, opened in binary mode
+            max_results: Maximum number of results from this file
+
+        Returns:
+            List of SearchResult objects from this file
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+            IOError: If the file can't be read
+        """
         results = []
+        first_line = 1
+        carry = b''
+
+        while True:
+            chunk = f.read(_STREAM_BYTES)
+            if chunk:
+                cut = chunk.rfind(b'\n')
+                if cut < 0:
+                    carry += chunk
+                    continue
+                # The \r of a \r\n pair is read as one newline in text mode
+                end = cut
+                if chunk[cut - 1:cut] == b'\r':
+                    end -= 1
+                elif not cut and carry.endswith(b'\r'):
+                    carry = carry[:-1]
+                block = b''.join((carry, memoryview(chunk)[:end]))
+                carry = chunk[cut + 1:]
+            else:
+                block = carry
+
+            if len(results) >= max_results:
+                _check_utf8(block)
+            else:
+                content = self._decode_if_match(block)
+                if content is not None:
+                    results.extend(self._search_content(
+                        file_path, content, 0, max_results - len(results), first_line,
+                    ))
+                else:
+                    # Skipped without decoding unless it was searched as ASCII
+                    _check_utf8(block)
+
+            if not chunk:
+                break
+            # Lines of the block as text mode reads it, \r\n and lone \r included
+            first_line += block.count(b'\n') + 1
+            if b'\r' in block:
+                first_line += block.count(b'\r') - block.count(b'\r\n')
+
+        return results
+
+    def _decode_if_match(self, data: bytes) -> Optional[str]:
+        """Decode file data unless the pattern can't match it.
+
+        Data lacking the pattern's required literal is skipped, and ASCII
+        data is searched as bytes and decoded only on a match; the text
+        returned is the same as a UTF-8 text-mode read.
+
+        Args:
+            data: File content, or a run of whole lines of it
+
+        Returns:
+            Decoded content, or None if it has no match
+
+        Raises:
+            UnicodeDecodeError: If the data is not valid UTF-8
+        """
+        if self._must_contain is not None and self._must_contain not in data:
+            return None
+
+        if self._bytes_pattern is not None and _is_plain_ascii(data):
+            if self._bytes_pattern.search(data) is None:
+                return None
+            return data.decode('ascii')
 
+        return _decode(data)
+
+    def _count_file(self, file_path: Union[str, Path]) -> int:
+        """Count the matches in a single file without building results.
+
+        Args:
+            file_path: Path to the file to search
+
+        Returns:
+            Number of matches, as many as _search_file would return
+        """
         try:
-            content = file_path.read_text(encoding='utf-8')
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            if self._must_contain is not None and self._must_contain not in data:
+                return 0
+            if self._bytes_pattern is not None and _is_plain_ascii(data):
+                return sum(1 for _ in self._bytes_pattern.finditer(data))
+            content = _decode(data)
         except (UnicodeDecodeError, IOError):
-            return []
+            return 0
+
+        if self._file_pattern is not None:
+            return sum(1 for _ in self._file_pattern.finditer(content))
+        return sum(1 for line in content.split('\n') for _ in self.pattern.finditer(line))
 
+    def _search_lines(
+        self,
+        file_path: Union[str, Path],
+        content: str,
+        context_lines: int,
+        max_results: int,
+    ) -> List[SearchResult]:
+        """Search a file line by line.
+
+        Args:
+            file_path: Path of the file searched
+            content: File content
+            context_lines: Number of lines to include before/after match
+            max_results: Maximum number of results from this file
+
+        Returns:
+            List of SearchResult objects from this file
+        """
+        results = []
         lines = content.split('\n')
 
         for line_num, line in enumerate(lines, 1):
             if len(results) >= max_results:
                 break
 
-            # Find all matches in this line
+            # Find all matches in this line; they share its context lines
+            context = None
             for match in self.pattern.finditer(line):
                 if len(results) >= max_results:
                     break
@@ -168,15 +504,9 @@ class SearchEngine:
                 context_after = []
 
                 if context_lines > 0:
-                    start_context = max(0, line_num - 1 - context_lines)
-                    end_context = min(len(lines), line_num + context_lines)
-
-                    context_before = [
-                        lines[i].rstrip() for i in range(start_context, line_num - 1)
-                    ]
-                    context_after = [
-                        lines[i].rstrip() for i in range(line_num, end_context)
-                    ]
+                    if context is None:
+                        context = _context(lines, line_num, context_lines)
+                    context_before, context_after = context[0][:], context[1][:]
 
                 result = SearchResult(
                     file_path=file_path,
@@ -190,12 +520,70 @@ class SearchEngine:
 
         return results
 
+    def _search_content(
+        self,
+        file_path: Union[str, Path],
+        content: str,
+        context_lines: int,
+        max_results: int,
+        first_line: int = 1,
+    ) -> List[SearchResult]:
+        """Search a whole file in one pass of the line-local pattern.
+
+        Gives the same results as matching line by line; line and column
+        numbers are recovered from the match offsets.
+
+        Args:
+            file_path: Path of the file searched
+            content: File content, or a run of whole lines of it
+            context_lines: Number of lines to include before/after match
+            max_results: Maximum number of results from this file
+            first_line: Line number of the first line of content
+
+        Returns:
+            List of SearchResult objects from this file
+        """
+        results = []
+        line_index = LineIndex(content)
+        lines = content.split('\n') if context_lines > 0 else None
+        context_line = 0
+        context = None
+
+        for match in self._file_pattern.finditer(content):
+            if len(results) >= max_results:
+                break
+
+            start = match.start()
+            line_num = line_index.line_number(start)
+            line_start = line_index.newlines[line_num - 2] + 1 if line_num > 1 else 0
+
+            context_before = []
+            context_after = []
+            if lines is not None:
+                # Matches on one line share its context lines
+                if line_num != context_line:
+                    context_line = line_num
+                    context = _context(lines, line_num, context_lines)
+                context_before, context_after = context[0][:], context[1][:]
+
+            results.append(SearchResult(
+                file_path=file_path,
+                line_number=first_line + line_num - 1,
+                column_number=start - line_start + 1,  # 1-indexed
+                matched_text=match.group(),
+                context_before=context_before,
+                context_after=context_after,
+            ))
+
+        return results
+
     def count_matches(
         self,
         root_path: str = ".",
         recursive: bool = True,
         include_pattern: str = "*",
         exclude_pattern: Optional[str] = None,
+        max_workers: Optional[int] = None,
     ) -> int:
         """Count total matches across all files.
 
@@ -204,18 +592,203 @@ class SearchEngine:
             recursive: Whether to search recursively
             include_pattern: File glob pattern to include
             exclude_pattern: File glob pattern to exclude
+            max_workers: Worker process limit (default: available CPUs, 1 disables)
 
         Returns:
             Total number of matches
+
+        Raises:
+            ValueError: If root_path doesn't exist
         """
-        results = self.search(
-            root_path=root_path,
-            recursive=recursive,
-            include_pattern=include_pattern,
-            exclude_pattern=exclude_pattern,
-            max_results=float('inf'),  # type: ignore
-        )
-        return len(results)
+        root = Path(root_path)
+        if not root.exists():
+            raise ValueError(f"Path does not exist: {root_path}")
+
+        files = _iter_files(root, recursive, include_pattern, exclude_pattern)
+        workers = max_workers or available_cpus()
+        if workers > 1:
+            files = list(files)
+            if len(files) >= _PARALLEL_MIN_FILES:
+                try:
+                    return sum(self._map_batches(_count_batch, files, workers))
+                except (OSError, BrokenProcessPool):
+                    # No usable process pool here; count in-process
+                    pass
+
+        return sum(map(self._count_file, files))
+
+
+def _context(lines: List[str], line_num: int, context_lines: int) -> Tuple[List[str], List[str]]:
+    """Return the lines around a 1-indexed line, right-stripped.
+
+    Args:
+        lines: Lines of the file
+        line_num: 1-indexed line of the match
+        context_lines: Number of lines to include before/after
+
+    Returns:
+        (lines before, lines after)
+    """
+    start_context = max(0, line_num - 1 - context_lines)
+    end_context = min(len(lines), line_num + context_lines)
+
+    context_before = [
+        lines[i].rstrip() for i in range(start_context, line_num - 1)
+    ]
+    context_after = [
+        lines[i].rstrip() for i in range(line_num, end_context)
+    ]
+    return context_before, context_after
+
+
+def _init_worker(pattern: str, case_insensitive: bool, use_re2: bool) -> None:
+    """Worker process initializer: compile the pattern once per process."""
+    global _worker_engine
+    _worker_engine = SearchEngine(pattern, case_insensitive=case_insensitive, use_re2=use_re2)
+
+
+def _search_batch(
+    files: List[Union[str, Path]],
+    context_lines: int,
+    max_results: int,
+) -> List[SearchResult]:
+    """Worker process entry point: search a batch of files in order."""
+    return _worker_engine._search_files(files, context_lines, max_results)
+
+
+def _count_batch(files: List[Union[str, Path]]) -> int:
+    """Worker process entry point: count the matches in a batch of files."""
+    return sum(map(_worker_engine._count_file, files))
+
+
+def _is_plain_ascii(data: bytes) -> bool:
+    """Tell whether a bytes pattern matches data as its str pattern matches the text."""
+    return data.isascii() and not any(b in data for b in _TEXT_ONLY_BYTES)
+
+
+def _check_utf8(data: bytes) -> None:
+    """Check that file data is UTF-8, as decoding it would.
+
+    Raises:
+        UnicodeDecodeError: If the data is not valid UTF-8
+    """
+    if not data.isascii():
+        data.decode('utf-8')
+
+
+def _decode(data: bytes) -> str:
+    """Decode file data the way a UTF-8 text-mode read does.
+
+    Raises:
+        UnicodeDecodeError: If the data is not valid UTF-8
+    """
+    content = data.decode('utf-8')
+    if '\r' in content:
+        # Universal newlines, as in text mode
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _iter_files(
+    root: Path,
+    recursive: bool,
+    include_pattern: str,
+    exclude_pattern: Optional[str],
+) -> Iterator[Union[str, Path]]:
+    """Yield the files to search, in ``Path.glob`` order.
+
+    Yields the files ``root.glob("**/" + include_pattern)`` (or
+    ``root.glob(include_pattern)``) would, minus those matching
+    ``exclude_pattern``. Single-component patterns are tested against
+    ``os.scandir`` entry names, so no Path is built for skipped entries and
+    file types come from the directory listing; other patterns go through
+    ``Path.glob`` and ``Path.match``.
+
+    Args:
+        root: Root directory
+        recursive: Whether to descend into subdirectories
+        include_pattern: File glob pattern to include
+        exclude_pattern: File glob pattern to exclude, or None
+
+    Yields:
+        File paths (str from the directory walk, Path from ``Path.glob``)
+    """
+    # Name patterns are translated to a regex once, not parsed per file
+    exclude_name = None
+    if exclude_pattern and _is_name_pattern(exclude_pattern):
+        exclude_name = _name_matcher(exclude_pattern)
+
+    if not _is_name_pattern(include_pattern):
+        glob_pattern = f"**/{include_pattern}" if recursive else include_pattern
+        for file_path in root.glob(glob_pattern):
+            if not file_path.is_file():
+                continue
+            if exclude_name is not None:
+                if exclude_name(file_path.name):
+                    continue
+            elif exclude_pattern and file_path.match(exclude_pattern):
+                continue
+            yield file_path
+        return
+
+    include_name = _name_matcher(include_pattern)
+
+    def walk(directory: str) -> Iterator[Union[str, Path]]:
+        try:
+            with os.scandir(directory) as scan:
+                entries = list(scan)
+        except OSError:
+            return
+
+        for entry in entries:
+            if not include_name(entry.name) or not entry.is_file():
+                continue
+            if exclude_name is not None:
+                if exclude_name(entry.name):
+                    continue
+            elif exclude_pattern and Path(entry.path).match(exclude_pattern):
+                continue
+            yield entry.path
+
+        # Like Path.glob, symlinked directories are not descended into
+        if recursive:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from walk(entry.path)
+
+    yield from walk(os.fspath(root))
+
+
+def _is_name_pattern(pattern: str) -> bool:
+    """Tell whether a glob pattern matches a single path component."""
+    return pattern not in ('', '.', '..') and '/' not in pattern and '**' not in pattern
+
+
+def _name_matcher(pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """Compile a single-component glob pattern, matched as ``fnmatchcase`` does."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def _unique_file_count(results: List[SearchResult]) -> int:
+    """Count the distinct files among search results.
+
+    Results of one file come in a run sharing one path object, so only
+    the first of each run needs hashing.
+
+    Args:
+        results: List of search results
+
+    Returns:
+        Number of distinct file paths
+    """
+    files = set()
+    last = None
+    for result in results:
+        file_path = result.file_path
+        if file_path is not last:
+            files.add(file_path)
+            last = file_path
+    return len(files)
 
 
 class OutputFormatter:
@@ -233,7 +806,7 @@ class OutputFormatter:
             Formatted output string
         """
         lines = []
-        files_with_matches = len(set(r.file_path for r in results))
+        files_with_matches = _unique_file_count(results)
 
         for result in results:
             line = f"{result.file_path}:{result.line_number}: {result.matched_text}"
@@ -262,7 +835,7 @@ class OutputFormatter:
         Returns:
             JSON formatted string
         """
-        files_with_matches = len(set(r.file_path for r in results))
+        files_with_matches = _unique_file_count(results)
 
         output = {
             'matches': [r.to_dict() for r in results],
@@ -284,19 +857,13 @@ class OutputFormatter:
             CSV formatted string
         """
         output = StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=['file', 'line', 'column', 'text'],
-        )
+        writer = csv.writer(output)
 
-        writer.writeheader()
-        for result in results:
-            writer.writerow({
-                'file': str(result.file_path),
-                'line': result.line_number,
-                'column': result.column_number,
-                'text': result.matched_text,
-            })
+        writer.writerow(('file', 'line', 'column', 'text'))
+        writer.writerows(
+            (str(result.file_path), result.line_number, result.column_number, result.matched_text)
+            for result in results
+        )
 
         return output.getvalue().rstrip()
 